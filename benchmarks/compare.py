@@ -0,0 +1,200 @@
+"""Run every version of the solver on one problem and compare runtime, memory and schedule quality side by side.
+
+Run by `python benchmarks/compare.py --years 13`, default problem is the real one of v3 main, use --synthetic for random problems.
+v4 rules hard code the siblings, so v4 schedule ignores the problem and is only scored against it.
+"""
+
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+
+import versions
+from synthetic import GONE, HOLIDAYS, Problem, family_problem, synthetic_problem
+
+# Seed of v4 main, our_rule picks randomly.
+V4_SEED = 49471
+
+# Solver builds inputs of its version and returns callable giving main couple family per holiday for each year.
+Schedule = Dict[int, List[str]]
+Solver = Callable[[SimpleNamespace, Problem], Callable[[], Schedule]]
+
+
+def solve_v1(v1: SimpleNamespace, problem: Problem) -> Callable[[], Schedule]:
+    """Best rotation of main possible families."""
+    couples = versions.v1_couples(problem, v1)
+    rotation = v1.module.Rotation(problem.main_possible)
+
+    def run() -> Schedule:
+        _, ours = rotation.best_rotation(couples)
+        return {
+            year: [hol.easter, hol.thanksgiving, hol.eve, hol.christmas]
+            for year, hol in zip(problem.years, ours.year_holidays)
+        }
+
+    return run
+
+
+def solve_v2(v2: SimpleNamespace, problem: Problem) -> Callable[[], Schedule]:
+    """Greedy year by year schedule."""
+    couples = versions.v2_couples(problem, v2)
+
+    def run() -> Schedule:
+        ours = v2.module.Schedule(problem.main_possible)
+        ours.calc_best_schedule(couples)
+        return {
+            year: ours.schedule_by_year[key].list
+            for year, key in zip(problem.years, sorted(ours.schedule_by_year))
+        }
+
+    return run
+
+
+def solve_v3(v3: SimpleNamespace, problem: Problem) -> Callable[[], Schedule]:
+    """Scheduler without history so all versions start equal."""
+    kwargs = versions.v3_scheduler_kwargs(problem, v3, history=False)
+
+    def run() -> Schedule:
+        scheduler = v3.schedule.Scheduler(**kwargs)
+        scheduler.schedule()
+        schedule: Schedule = {year: [GONE] * len(HOLIDAYS) for year in problem.years}
+        for place in scheduler.scheduled_places():
+            schedule[place.year][
+                HOLIDAYS.index(place.holiday.name.lower())
+            ] = place.family.value
+        return schedule
+
+    return run
+
+
+def solve_v4(v4: SimpleNamespace, problem: Problem) -> Callable[[], Schedule]:
+    """Our rule with seed of v4 main, siblings are its own hard coded rules."""
+
+    def run() -> Schedule:
+        schedule: Schedule = {year: [GONE] * len(HOLIDAYS) for year in problem.years}
+        for place in v4.schedule.our_rule(
+            start_year=problem.start_year,
+            num_years=problem.num_years,
+            rng=random.Random(V4_SEED),
+        ):
+            schedule[place.year][
+                HOLIDAYS.index(place.holiday.name.lower())
+            ] = place.family.value
+        return schedule
+
+    return run
+
+
+SOLVERS: Dict[str, Solver] = {
+    "v1": solve_v1,
+    "v2": solve_v2,
+    "v3": solve_v3,
+    "v4": solve_v4,
+}
+
+
+def score(problem: Problem, schedule: Schedule) -> Dict:
+    """Sibling matches, available sibling holidays and family spread of main couple schedule.
+
+    Spread score is as v3 Scheduler, sum over families of 1 - abs(share - target)/target, higher is better.
+    """
+    matches = {couple: 0 for couple in problem.cycles}
+    available = {couple: 0 for couple in problem.cycles}
+    counts = {family: 0 for family in problem.families}
+    for year in problem.years:
+        for hol_idx, family in enumerate(schedule[year]):
+            counts[family] = counts.get(family, 0) + 1
+            for couple in problem.cycles:
+                sib_family = problem.sibling_year(couple, year)[hol_idx]
+                available[couple] += sib_family != GONE
+                matches[couple] += sib_family == family
+    total = sum(counts.values())
+    spread = sum(
+        1 - abs(target - counts.get(family, 0) / total) / target
+        for family, target in problem.target_dist.items()
+    )
+    return {
+        "matches": matches,
+        "available": available,
+        "family_counts": counts,
+        "spread_score": spread,
+    }
+
+
+def run_version(version: str, problem: Problem) -> Dict:
+    """Time solver, then run again under tracemalloc for peak memory, then score schedule."""
+    run = SOLVERS[version](versions.load(version), problem)
+    start = time.perf_counter()
+    schedule = run()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "version": version,
+        "seconds": seconds,
+        "peak_bytes": peak,
+        **score(problem, schedule),
+    }
+
+
+def print_table(problem: Problem, results: List[Dict]) -> None:
+    """Side by side table of each version."""
+    couples = list(problem.cycles)
+    header = (
+        f"|{'version':^9}|{'ms':^10}|{'peak KiB':^10}|"
+        + "".join(f"{couple:^9}|" for couple in couples)
+        + f"{'spread':^8}|"
+        + "".join(f"{family:^9}|" for family in problem.families)
+    )
+    print(header)
+    for result in results:
+        print(
+            f"|{result['version']:^9}|{result['seconds'] * 1e3:^10.2f}|{result['peak_bytes'] / 1024:^10.1f}|"
+            + "".join(
+                f"{result['matches'][couple]:>3}/{result['available'][couple]:<5}|"
+                for couple in couples
+            )
+            + f"{result['spread_score']:^8.3f}|"
+            + "".join(
+                f"{result['family_counts'].get(family, 0):^9}|"
+                for family in problem.families
+            )
+        )
+
+
+def main() -> None:
+    """Compare versions on one problem."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--years", type=int, default=13)
+    parser.add_argument(
+        "--synthetic",
+        action="store_true",
+        help="Random problem instead of v3 main problem.",
+    )
+    parser.add_argument("--couples", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--versions", nargs="+", default=list(SOLVERS))
+    parser.add_argument(
+        "--out", type=Path, default=None, help="Save results json here."
+    )
+    args = parser.parse_args()
+
+    problem = (
+        synthetic_problem(args.years, num_couples=args.couples, seed=args.seed)
+        if args.synthetic
+        else family_problem(args.years)
+    )
+    results = [run_version(version, problem) for version in args.versions]
+    print_table(problem, results)
+    if args.out is not None:
+        args.out.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""Peak memory and memory left allocated by each phase of v2 Schedule, v3 Scheduler and v4 rule runs, measured with tracemalloc.
+
+Run by `python benchmarks/memory.py --years 64` for a report, or `python benchmarks/memory.py --check` to run the
+standard synthetic problem and exit nonzero if any phase goes over its budget in BUDGETS, test_memory.py runs the same check as tests.
+Peak is the highest traced memory during the phase above what was traced when it started,
+retained bytes and blocks are the net memory blocks the phase left allocated, e.g. places kept in a schedule, not the number of allocations it made.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Tuple
+
+import versions
+from synthetic import Problem, synthetic_problem
+
+# Phase is a name and callable run under tracemalloc, phases of a version run in order and may use results of earlier ones.
+Phases = List[Tuple[str, Callable[[], object]]]
+
+# Problem of --check, synthetic_problem with default sizes and this many years.
+BUDGET_YEARS = 64
+# Peak bytes allowed for each phase of the budget problem, about twice what it measures so only real regressions fail.
+BUDGETS: Dict[str, int] = {
+    "v2.all_schedules": 8_000,
+    "v2.schedule": 26_000,
+    "v2.spread": 3_000,
+    "v3.setup": 432_000,
+    "v3.schedule": 192_000,
+    "v3.report": 768_000,
+    "v4.siblings": 155_000,
+    "v4.our_rule": 78_000,
+    "v4.matches": 38_000,
+    "v4.spread_table": 12_000,
+}
+
+
+def v2_phases(v2: SimpleNamespace, problem: Problem) -> Phases:
+    """Possible year schedules, greedy schedule of all years and spread tables."""
+    couples = versions.v2_couples(problem, v2)
+    schedule = v2.module.Schedule(problem.main_possible)
+    return [
+        ("all_schedules", lambda: schedule.all_schedules),
+        ("schedule", lambda: schedule.calc_best_schedule(couples)),
+        ("spread", lambda: (schedule.holiday_spread, schedule.family_spread)),
+    ]
+
+
+def v3_phases(v3: SimpleNamespace, problem: Problem) -> Phases:
+    """Scheduler construction from history, schedule and report of all places."""
+    kwargs = versions.v3_scheduler_kwargs(problem, v3)
+    state: Dict[str, object] = {}
+
+    def setup() -> None:
+        state["scheduler"] = v3.schedule.Scheduler(**kwargs)
+
+    def report() -> None:
+        v3.report.Report(state["scheduler"].all_places(), kwargs["couple"]).write(
+            io.StringIO()
+        )
+
+    return [
+        ("setup", setup),
+        ("schedule", lambda: state["scheduler"].schedule()),
+        ("report", report),
+    ]
+
+
+def v4_phases(v4: SimpleNamespace, problem: Problem) -> Phases:
+    """Sibling rules, our rule, matches and spread table, v4 rules are hard coded so only the horizon is used."""
+    state: Dict[str, list] = {}
+
+    def siblings() -> None:
+        state["ali"] = v4.schedule.ali_rule(problem.start_year, problem.num_years)
+        state["lauren"] = v4.schedule.lauren_rule(problem.start_year, problem.num_years)
+
+    def our_rule() -> None:
+        state["us"] = v4.schedule.our_rule(
+            problem.start_year, problem.num_years, rng=random.Random(0)
+        )
+
+    def spread_table() -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            v4.stats.spread_table(state["us"])
+
+    return [
+        ("siblings", siblings),
+        ("our_rule", our_rule),
+        ("matches", lambda: v4.stats.matches(state["us"], state["ali"])),
+        ("spread_table", spread_table),
+    ]
+
+
+VERSIONS: Dict[str, Callable[[SimpleNamespace, Problem], Phases]] = {
+    "v2": v2_phases,
+    "v3": v3_phases,
+    "v4": v4_phases,
+}
+
+
+def measure(phases: Phases, prefix: str) -> Dict[str, Dict[str, int]]:
+    """Peak bytes over start of each phase and bytes and blocks it left allocated, keyed by prefix.phase."""
+    results = {}
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    tracemalloc.start()
+    try:
+        for name, phase in phases:
+            before = tracemalloc.take_snapshot().filter_traces(filters)
+            tracemalloc.reset_peak()
+            start, _ = tracemalloc.get_traced_memory()
+            phase()
+            _, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot().filter_traces(filters)
+            diff = after.compare_to(before, "filename")
+            results[f"{prefix}.{name}"] = {
+                "peak_bytes": peak - start,
+                "retained_bytes": sum(stat.size_diff for stat in diff),
+                "retained_blocks": sum(stat.count_diff for stat in diff),
+            }
+    finally:
+        tracemalloc.stop()
+    return results
+
+
+def budget_problem() -> Problem:
+    """Standard synthetic problem BUDGETS are measured on."""
+    return synthetic_problem(BUDGET_YEARS)
+
+
+def run_memory(problem: Problem, only: List[str]) -> Dict[str, Dict[str, int]]:
+    """Measure phases of every version in only."""
+    results = {}
+    for version in only:
+        phases = VERSIONS[version](versions.load(version), problem)
+        results.update(measure(phases, version))
+    return results
+
+
+def check(results: Dict[str, Dict[str, int]]) -> List[str]:
+    """Phases over their budget, with peak and budget."""
+    return [
+        f"{name} peak {results[name]['peak_bytes']} bytes over budget {budget}"
+        for name, budget in BUDGETS.items()
+        if name in results and results[name]["peak_bytes"] > budget
+    ]
+
+
+def main() -> None:
+    """Print memory of each phase and check budgets."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--years", type=int, default=BUDGET_YEARS)
+    parser.add_argument("--couples", type=int, default=2)
+    parser.add_argument("--versions", nargs="+", default=list(VERSIONS))
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help=f"Run budget problem of {BUDGET_YEARS} years and exit 1 if a phase is over budget.",
+    )
+    parser.add_argument(
+        "--out", type=Path, default=None, help="Save results json here."
+    )
+    args = parser.parse_args()
+
+    problem = (
+        budget_problem()
+        if args.check
+        else synthetic_problem(args.years, num_couples=args.couples)
+    )
+    results = run_memory(problem, args.versions)
+    print(f"{'phase':20} {'peak KiB':>10} {'retained KiB':>13} {'retained blocks':>16}")
+    for name, result in results.items():
+        print(
+            f"{name:20} {result['peak_bytes'] / 1024:10.1f} {result['retained_bytes'] / 1024:13.1f} {result['retained_blocks']:16}"
+        )
+    if args.out is not None:
+        args.out.write_text(json.dumps(results, indent=2))
+    if args.check:
+        failures = check(results)
+        for failure in failures:
+            print(failure, file=sys.stderr)
+        sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Scaling of v3 sibling matching with number of couples and years.
+
+Run by `python benchmarks/sibling_match.py`, time per place should stay flat as years and couples grow.
+"""
+
+import random
+import sys
+import time
+from enum import Enum
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "v3"))
+
+from holidays.constants import Families, Holidays, Status  # noqa: E402
+from holidays.funcs import sibling_match_count  # noqa: E402
+from holidays.index import PlaceIndex  # noqa: E402
+from holidays.place import Place  # noqa: E402
+
+NUM_COUPLES = [2, 5, 10, 20]
+NUM_YEARS = [50, 100, 200, 400, 800]
+REPEATS = 3
+
+
+def synthetic_places(couples: List[Enum], num_years: int, seed: int = 0) -> List[Place]:
+    """Random place for every couple, year and holiday."""
+    rng = random.Random(seed)
+    families = list(Families)
+    return [
+        Place(
+            year=year,
+            couple=couple,  # type: ignore
+            holiday=holiday,
+            family=rng.choice(families),
+            status=Status.PRIMARY,
+        )
+        for year in range(num_years)
+        for holiday in Holidays
+        for couple in couples
+    ]
+
+
+def best_time(func, *args) -> float:
+    """Best wall time of repeated calls."""
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    """Time hash join and index lookups for each number of couples and years."""
+    print(
+        f"|{'couples':^9}|{'years':^7}|{'places':^8}|{'join ms':^9}|{'join us/place':^15}|{'index ms':^10}|{'index us/place':^16}|"
+    )
+    for num_couples in NUM_COUPLES:
+        couples = list(Enum("Couples", [f"C{idx}" for idx in range(num_couples)]))  # type: ignore
+        for num_years in NUM_YEARS:
+            places = synthetic_places(couples, num_years)
+            join = best_time(sibling_match_count, places, couples[0])
+            index = PlaceIndex.from_places(places)
+            lookup = best_time(index.match_count, couples[0])
+            print(
+                f"|{num_couples:^9}|{num_years:^7}|{len(places):^8}|{join * 1e3:^9.2f}|{join / len(places) * 1e6:^15.3f}"
+                f"|{lookup * 1e3:^10.2f}|{lookup / len(places) * 1e6:^16.3f}|"
+            )
+
+
+if __name__ == "__main__":
+    main()
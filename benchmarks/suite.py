@@ -0,0 +1,266 @@
+"""Microbenchmarks of scheduling hot paths of every version over growing horizons.
+
+Run by `python benchmarks/suite.py --out bench.json`, then after a change `python benchmarks/suite.py --compare bench.json`.
+Each benchmark is timed on synthetic problems of each horizon, slope of log time against log years tells
+if it is constant (~0), linear (~1) or quadratic (~2) in horizon length.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import platform
+import subprocess
+import sys
+import timeit
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+
+import versions
+from synthetic import MAIN, Problem, synthetic_problem
+
+# Benchmark builds a zero argument callable to time from loaded version modules and problem, setup is not timed.
+Benchmark = Callable[[SimpleNamespace, Problem], Callable[[], object]]
+
+
+def _v3_scheduler(v3: SimpleNamespace, problem: Problem):
+    """Scheduler with num_years of history, ready to allocate first year."""
+    return v3.schedule.Scheduler(**versions.v3_scheduler_kwargs(problem, v3))
+
+
+def _v3_place(v3: SimpleNamespace, problem: Problem):
+    """Candidate place of main couple at start year."""
+    return v3.place.Place(
+        year=problem.start_year,
+        couple=v3.constants.Couples[MAIN.upper()],
+        holiday=v3.constants.Holidays.EASTER,
+        family=v3.constants.Families[problem.families[0].upper()],
+        status=v3.constants.Status.PRIMARY,
+    )
+
+
+def v3_attempt_allocation(v3: SimpleNamespace, problem: Problem):
+    """Choose family for first holiday of start year."""
+    scheduler = _v3_scheduler(v3, problem)
+    return lambda: scheduler._attempt_allocation(
+        problem.start_year, v3.constants.Holidays.EASTER
+    )
+
+
+def v3_calc_fam_spread(v3: SimpleNamespace, problem: Problem):
+    """Spread score of one candidate place."""
+    scheduler = _v3_scheduler(v3, problem)
+    place = _v3_place(v3, problem)
+    return lambda: scheduler._calc_fam_spread(place)
+
+
+def v3_calc_sib_match(v3: SimpleNamespace, problem: Problem):
+    """Sibling match score of one candidate place."""
+    scheduler = _v3_scheduler(v3, problem)
+    place = _v3_place(v3, problem)
+    return lambda: scheduler._calc_sib_match(place)
+
+
+def v3_schedule(v3: SimpleNamespace, problem: Problem):
+    """Whole schedule of horizon, including building scheduler from history."""
+    kwargs = versions.v3_scheduler_kwargs(problem, v3)
+    return lambda: v3.schedule.Scheduler(**kwargs).schedule()
+
+
+def v3_sibling_match_count(v3: SimpleNamespace, problem: Problem):
+    """Matches of main couple over history list."""
+    places = versions.v3_places(problem, v3)
+    couple = v3.constants.Couples[MAIN.upper()]
+    return lambda: v3.funcs.sibling_match_count(places, couple)
+
+
+def v3_couple_holiday_count(v3: SimpleNamespace, problem: Problem):
+    """Family counts of main couple over history table."""
+    places = v3.table.PlaceTable.from_places(versions.v3_places(problem, v3))
+    couple = v3.constants.Couples[MAIN.upper()]
+    return lambda: v3.funcs.couple_holiday_count(places, couple)
+
+
+def v4_spread_table(v4: SimpleNamespace, problem: Problem):
+    """Spread table of main couple history, printing discarded."""
+    places = versions.v4_places(problem, v4)[MAIN]
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            v4.stats.spread_table(places)
+
+    return run
+
+
+def v4_matches(v4: SimpleNamespace, problem: Problem):
+    """Matches between main couple and first sibling history."""
+    places = versions.v4_places(problem, v4)
+    other = next(couple for couple in places if couple != MAIN)
+    return lambda: v4.stats.matches(places[MAIN], places[other])
+
+
+def v2_best_year_by_year(v2: SimpleNamespace, problem: Problem):
+    """One year choice with all but last year of horizon already scheduled."""
+    couples = versions.v2_couples(problem, v2)
+    schedule = v2.module.Schedule(problem.main_possible)
+    years = couples[0].years
+    for idx, year in enumerate(years[:-1]):
+        schedule.add_year(
+            schedule.all_schedules[idx % len(schedule.all_schedules)], year
+        )
+    return lambda: schedule.best_year_by_year(couples, years[-1])
+
+
+def v1_best_rotation(v1: SimpleNamespace, problem: Problem):
+    """Best rotation of main possible families against all siblings."""
+    couples = versions.v1_couples(problem, v1)
+    rotation = v1.module.Rotation(problem.main_possible)
+    return lambda: rotation.best_rotation(couples)
+
+
+BENCHMARKS: Dict[str, Dict[str, Benchmark]] = {
+    "v1": {"v1.best_rotation": v1_best_rotation},
+    "v2": {"v2.best_year_by_year": v2_best_year_by_year},
+    "v3": {
+        "v3.attempt_allocation": v3_attempt_allocation,
+        "v3.calc_fam_spread": v3_calc_fam_spread,
+        "v3.calc_sib_match": v3_calc_sib_match,
+        "v3.schedule": v3_schedule,
+        "v3.sibling_match_count": v3_sibling_match_count,
+        "v3.couple_holiday_count": v3_couple_holiday_count,
+    },
+    "v4": {"v4.spread_table": v4_spread_table, "v4.matches": v4_matches},
+}
+
+
+def time_call(func: Callable[[], object], repeat: int = 3) -> float:
+    """Best seconds per call, number of calls per repeat chosen so a repeat takes at least 0.2s."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def scaling(years: List[int], seconds: List[float]) -> Dict[str, object]:
+    """Least squares slope of log seconds against log years and name of growth it is closest to."""
+    xs = [math.log(year) for year in years]
+    ys = [math.log(sec) for sec in seconds]
+    x_mean, y_mean = sum(xs) / len(xs), sum(ys) / len(ys)
+    var = sum((x - x_mean) ** 2 for x in xs)
+    slope = (
+        sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys)) / var if var else 0.0
+    )
+    labels = ["constant", "linear", "quadratic", "cubic"]
+    return {
+        "slope": slope,
+        "scaling": labels[min(max(round(slope), 0), len(labels) - 1)],
+    }
+
+
+def run_suite(
+    horizons: List[int],
+    num_couples: int,
+    num_families: int,
+    num_holidays: int,
+    only: Optional[str] = None,
+) -> Dict[str, Dict]:
+    """Time every benchmark at every horizon, results keyed by benchmark name."""
+    results: Dict[str, Dict] = {}
+    for version, benchmarks in BENCHMARKS.items():
+        selected = {
+            name: bench
+            for name, bench in benchmarks.items()
+            if only is None or only in name
+        }
+        if len(selected) == 0:
+            continue
+        modules = versions.load(version)
+        for name, bench in selected.items():
+            seconds = []
+            for num_years in horizons:
+                problem = synthetic_problem(
+                    num_years, num_couples, num_families, num_holidays
+                )
+                seconds.append(time_call(bench(modules, problem)))
+            results[name] = {
+                "years": horizons,
+                "seconds": seconds,
+                **scaling(horizons, seconds),
+            }
+            print(
+                f"{name:28} {results[name]['scaling']:10} slope {results[name]['slope']:5.2f} "
+                + " ".join(f"{sec * 1e6:10.1f}us" for sec in seconds)
+            )
+    return results
+
+
+def git_commit() -> Optional[str]:
+    """Current commit of repo if available."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=versions.ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: Dict[str, Dict], baseline_path: Path) -> None:
+    """Print ratio of new to baseline time for benchmarks and horizons in both."""
+    baseline = json.loads(baseline_path.read_text())["results"]
+    print(f"\nCompared to {baseline_path}, ratio new / old time")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        old = dict(zip(baseline[name]["years"], baseline[name]["seconds"]))
+        ratios = [
+            f"{year}y x{sec / old[year]:.2f}"
+            for year, sec in zip(result["years"], result["seconds"])
+            if year in old
+        ]
+        print(f"{name:28} {' '.join(ratios)}")
+
+
+def main() -> None:
+    """Run suite, save results and compare to baseline."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--years", type=int, nargs="+", default=[8, 16, 32, 64, 128])
+    parser.add_argument("--couples", type=int, default=2)
+    parser.add_argument("--families", type=int, default=3)
+    parser.add_argument("--holidays", type=int, default=4)
+    parser.add_argument(
+        "--only", default=None, help="Only benchmarks with name containing this."
+    )
+    parser.add_argument(
+        "--out", type=Path, default=None, help="Save results json here."
+    )
+    parser.add_argument(
+        "--compare", type=Path, default=None, help="Results json to diff against."
+    )
+    args = parser.parse_args()
+
+    results = run_suite(
+        args.years, args.couples, args.families, args.holidays, args.only
+    )
+    if args.out is not None:
+        args.out.write_text(
+            json.dumps(
+                {
+                    "commit": git_commit(),
+                    "python": platform.python_version(),
+                    "argv": sys.argv[1:],
+                    "results": results,
+                },
+                indent=2,
+            )
+        )
+    if args.compare is not None:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Synthetic scheduling problems shared by benchmarks of every version.
+
+Problem is written with plain strings so each version can build its own input from it, see versions.py.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+# Holidays in order of v1 and v2 Year fields, names match v3 and v4 Holidays enum names lower case.
+HOLIDAYS = ["easter", "thanksgiving", "eve", "christmas"]
+FAMILIES = ["Gresko", "Palombo", "Pendola"]
+SIBLINGS = ["Ali", "Lauren", "James", "George"]
+MAIN = "Us"
+GONE = "GONE"
+
+
+@dataclass
+class Problem:
+    """Scheduling problem for main couple against siblings with fixed rotations.
+
+    Parameters
+    ----------
+
+    start_year: int
+        First year to schedule.
+    num_years: int
+        Number of years to schedule, also number of history years before start.
+    holidays: List[str]
+        Holidays each year, subset of HOLIDAYS in order.
+    families: List[str]
+        Families main couple can go to.
+    main_possible: List[str]
+        Family of each holiday slot of a year for main couple, repeats allowed e.g. Gresko twice.
+    target_dist: Dict[str, float]
+        Target share of holidays for each family.
+    cycles: Dict[str, List[List[str]]]
+        Rotation of each sibling, list of years of family per holiday. Year y uses cycle[y % len(cycle)].
+    sib_weights: Dict[str, float]
+        Importance of matching each sibling.
+    """
+
+    start_year: int
+    num_years: int
+    holidays: List[str]
+    families: List[str]
+    main_possible: List[str]
+    target_dist: Dict[str, float]
+    cycles: Dict[str, List[List[str]]]
+    sib_weights: Dict[str, float]
+
+    @property
+    def years(self) -> List[int]:
+        """Years to schedule."""
+        return list(range(self.start_year, self.start_year + self.num_years))
+
+    def sibling_year(self, couple: str, year: int) -> List[str]:
+        """Family per holiday of sibling for year."""
+        cycle = self.cycles[couple]
+        return cycle[year % len(cycle)]
+
+    def history(self) -> List[Tuple[int, str, str, str]]:
+        """Places of num_years before start, main couple cycling through possible families, as year couple holiday family."""
+        history = []
+        for idx, year in enumerate(
+            range(self.start_year - self.num_years, self.start_year)
+        ):
+            for hol_idx, holiday in enumerate(self.holidays):
+                family = self.main_possible[(idx + hol_idx) % len(self.main_possible)]
+                history.append((year, MAIN, holiday, family))
+                for couple in self.cycles:
+                    history.append(
+                        (
+                            year,
+                            couple,
+                            holiday,
+                            self.sibling_year(couple, year)[hol_idx],
+                        )
+                    )
+        return history
+
+
+def synthetic_problem(
+    num_years: int,
+    num_couples: int = 2,
+    num_families: int = 3,
+    num_holidays: int = 4,
+    seed: int = 0,
+) -> Problem:
+    """Random problem of given size, siblings get rotations of 1 to 3 years with some holidays GONE.
+
+    Sizes are capped by names available, num_couples up to 4 siblings, num_families up to 3, num_holidays up to 4.
+    """
+    if (
+        num_couples > len(SIBLINGS)
+        or num_families > len(FAMILIES)
+        or num_holidays > len(HOLIDAYS)
+    ):
+        raise ValueError(
+            f"At most {len(SIBLINGS)} couples, {len(FAMILIES)} families and {len(HOLIDAYS)} holidays"
+        )
+    rng = random.Random(seed)
+    holidays = HOLIDAYS[:num_holidays]
+    families = FAMILIES[:num_families]
+    main_possible = sorted(
+        (families[idx % num_families] for idx in range(num_holidays)),
+        key=families.index,
+    )
+    cycles = {
+        couple: [
+            [rng.choice(families + [GONE]) for _ in holidays]
+            for _ in range(rng.randint(1, 3))
+        ]
+        for couple in SIBLINGS[:num_couples]
+    }
+    return Problem(
+        start_year=2023,
+        num_years=num_years,
+        holidays=holidays,
+        families=families,
+        main_possible=main_possible,
+        target_dist={family: 1 / num_families for family in families},
+        cycles=cycles,
+        sib_weights={couple: 1.0 for couple in cycles},
+    )
+
+
+def family_problem(num_years: int, start_year: int = 2023) -> Problem:
+    """The real problem of v3 main, Ali on 3 year rotation, Lauren on 2 year rotation and James always at Gresko."""
+    return Problem(
+        start_year=start_year,
+        num_years=num_years,
+        holidays=HOLIDAYS,
+        families=FAMILIES,
+        main_possible=["Gresko", "Gresko", "Palombo", "Pendola"],
+        target_dist={"Gresko": 0.44, "Palombo": 0.28, "Pendola": 0.28},
+        cycles={
+            "Ali": [
+                ["Palombo", "Palombo", "Pendola", GONE],
+                [GONE, "Pendola", GONE, "Palombo"],
+                ["Pendola", GONE, "Palombo", "Pendola"],
+            ],
+            "Lauren": [[GONE, GONE, "Gresko", "Gresko"], [GONE, "Gresko", GONE, GONE]],
+            "James": [["Gresko", "Gresko", "Gresko", "Gresko"]],
+        },
+        sib_weights={"Ali": 1.0, "Lauren": 1.0, "James": 0.01},
+    )
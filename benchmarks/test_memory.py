@@ -0,0 +1,34 @@
+"""Memory budget tests, each phase of the budget problem must stay under its peak in memory.BUDGETS.
+
+Run by `python -m pytest benchmarks` or `python -m unittest discover benchmarks`.
+"""
+
+import unittest
+
+from memory import BUDGETS, budget_problem, run_memory
+
+
+class MemoryBudgetTest(unittest.TestCase):
+    """One test per version, one subtest per phase."""
+
+    def check_version(self, version: str) -> None:
+        results = run_memory(budget_problem(), [version])
+        for name, budget in BUDGETS.items():
+            if not name.startswith(f"{version}."):
+                continue
+            with self.subTest(phase=name):
+                self.assertIn(name, results)
+                self.assertLessEqual(results[name]["peak_bytes"], budget)
+
+    def test_v2(self) -> None:
+        self.check_version("v2")
+
+    def test_v3(self) -> None:
+        self.check_version("v3")
+
+    def test_v4(self) -> None:
+        self.check_version("v4")
+
+
+if __name__ == "__main__":
+    unittest.main()
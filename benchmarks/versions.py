@@ -0,0 +1,161 @@
+"""Load each version of the solver in isolation and build its input from a synthetic Problem.
+
+v3 and v4 are both a package named holidays, so loading one removes the other from sys.modules,
+modules already loaded keep working as they hold their own globals.
+"""
+
+import importlib
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+from typing import Dict, List
+
+from synthetic import MAIN, Problem
+
+ROOT = Path(__file__).parents[1]
+PACKAGE_MODULES = {
+    "v3": ["constants", "place", "table", "funcs", "rotation", "schedule", "report"],
+    "v4": ["constants", "place", "io", "schedule", "stats"],
+}
+
+
+def load(version: str) -> SimpleNamespace:
+    """Modules of version, v1 and v2 as attribute module, v3 and v4 with attribute per holidays submodule."""
+    if version in ("v1", "v2"):
+        path = ROOT / version / f"holidays_{version}.py"
+        spec = importlib.util.spec_from_file_location(f"holidays_{version}", path)
+        assert spec is not None and spec.loader is not None
+        module: ModuleType = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+        return SimpleNamespace(module=module)
+    for name in [name for name in sys.modules if name.split(".")[0] == "holidays"]:
+        del sys.modules[name]
+    sys.path.insert(0, str(ROOT / version))
+    try:
+        return SimpleNamespace(
+            **{
+                name: importlib.import_module(f"holidays.{name}")
+                for name in PACKAGE_MODULES[version]
+            }
+        )
+    finally:
+        sys.path.remove(str(ROOT / version))
+
+
+def _check_holidays(problem: Problem, version: str) -> None:
+    """v1 to v3 always schedule all 4 holidays."""
+    if len(problem.holidays) != 4:
+        raise ValueError(
+            f"{version} needs all 4 holidays, problem has {len(problem.holidays)}"
+        )
+
+
+def v1_couples(problem: Problem, v1: SimpleNamespace) -> list:
+    """Sibling Couple objects of v1 for every year."""
+    _check_holidays(problem, "v1")
+    return [
+        v1.module.Couple(
+            [
+                v1.module.Year(*problem.sibling_year(couple, year), str(year))
+                for year in problem.years
+            ],
+            couple.lower(),
+        )
+        for couple in problem.cycles
+    ]
+
+
+def v2_couples(problem: Problem, v2: SimpleNamespace) -> list:
+    """Sibling Couple objects of v2 for every year, v2 keys years from 2022."""
+    _check_holidays(problem, "v2")
+    return [
+        v2.module.Couple(
+            [
+                v2.module.Year(*problem.sibling_year(couple, year))
+                for year in problem.years
+            ],
+            couple.lower(),
+        )
+        for couple in problem.cycles
+    ]
+
+
+def _v3_family(v3: SimpleNamespace, family: str):
+    """Families member of name."""
+    return v3.constants.Families[family.upper()]
+
+
+def v3_scheduler_kwargs(
+    problem: Problem, v3: SimpleNamespace, history: bool = True
+) -> Dict:
+    """Keyword arguments of v3 Scheduler, history is num_years before start if used."""
+    _check_holidays(problem, "v3")
+    Couples = v3.constants.Couples
+    rotations = {
+        Couples[couple.upper()]: [
+            v3.rotation.Rotation(
+                easter=_v3_family(v3, year[0]),
+                thanks=_v3_family(v3, year[1]),
+                eve=_v3_family(v3, year[2]),
+                christmas=_v3_family(v3, year[3]),
+            )
+            for year in cycle
+        ]
+        for couple, cycle in problem.cycles.items()
+    }
+    return dict(
+        couple=Couples[MAIN.upper()],
+        start_year=problem.start_year,
+        num_years=problem.num_years,
+        fam_prime_dist={
+            _v3_family(v3, family): share
+            for family, share in problem.target_dist.items()
+        },
+        sib_weights={
+            Couples[couple.upper()]: weight
+            for couple, weight in problem.sib_weights.items()
+        },
+        rotations=rotations,
+        history=v3_places(problem, v3) if history else None,
+    )
+
+
+def v3_places(problem: Problem, v3: SimpleNamespace) -> List:
+    """History of problem as v3 places."""
+    Couples, Holidays, Status = (
+        v3.constants.Couples,
+        v3.constants.Holidays,
+        v3.constants.Status,
+    )
+    return [
+        v3.place.Place(
+            year=year,
+            couple=Couples[couple.upper()],
+            holiday=Holidays[holiday.upper()],
+            family=_v3_family(v3, family),
+            status=Status.PRIMARY,
+        )
+        for year, couple, holiday, family in problem.history()
+    ]
+
+
+def v4_places(problem: Problem, v4: SimpleNamespace) -> Dict[str, List]:
+    """History of problem as v4 places per couple."""
+    Couples, Holidays, Families = (
+        v4.constants.Couples,
+        v4.constants.Holidays,
+        v4.constants.Families,
+    )
+    places: Dict[str, List] = {}
+    for year, couple, holiday, family in problem.history():
+        places.setdefault(couple, []).append(
+            v4.place.Place(
+                year=year,
+                couple=Couples[couple.upper()],
+                holiday=Holidays[holiday.upper()],
+                family=Families[family.upper()],
+            )
+        )
+    return places
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import itertools
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+from typing import Iterator
+
+import numpy as np
 
 # Holiday Statuses
 GONE = "GONE"
@@ -9,6 +12,9 @@ Gresko = "Gresko"
 Palombo = "Palombo"
 Pendola = "Pendola"
 
+# Rotations scored at once by best_rotation, bounds memory of the comparison for large rotation pools
+ROTATION_CHUNK = 4096
+
 
 @dataclass
 class Year:
@@ -21,6 +27,10 @@ class Year:
     year: str = "2022"
 
 
+# Holiday fields of Year in order, each year of a couple has one family per holiday
+HOLIDAYS = [field.name for field in fields(Year) if field.name != "year"]
+
+
 class Couple:
     """Keeps years and holiday locations for different people."""
 
@@ -83,16 +93,47 @@ class Couple:
         return sum(x == y for x, y in zip(l1, l2))
 
 
+def cyclic_arrangements(items: list[str]) -> Iterator[list[str]]:
+    """Distinct orderings of all items with no equal neighbours, last and first item count as neighbours too.
+
+    Built one position at a time trying each distinct value once and never next to an equal value, so repeated items give no duplicates
+    and orderings that would fail are cut before they are finished. Orderings come in the order they first appear in itertools.permutations(items).
+    e.g. [Gresko, Gresko, Palombo, Pendola] gives [Gresko, Palombo, Gresko, Pendola], [Gresko, Pendola, Gresko, Palombo],
+    [Palombo, Gresko, Pendola, Gresko], [Pendola, Gresko, Palombo, Gresko]
+    """
+
+    def extend(arrangement: list[str], rest: list[str]) -> Iterator[list[str]]:
+        if not rest:
+            if len(arrangement) < 2 or arrangement[-1] != arrangement[0]:
+                yield arrangement
+            return
+        seen = set()
+        for idx, item in enumerate(rest):
+            if item in seen or (arrangement and arrangement[-1] == item):
+                continue
+            seen.add(item)
+            yield from extend(arrangement + [item], rest[:idx] + rest[idx + 1 :])
+
+    yield from extend([], list(items))
+
+
 class Rotation:
-    """Holds possible rotations for main couple when compared to other couple schedule."""
+    """Holds possible rotations for main couple when compared to other couple schedule.
+
+    Pool of possible families can be any length, each year holidays take the next len(HOLIDAYS) families of the rotation cyclically,
+    e.g. pool of 5 families gives holidays 0-3 the first year and 1-4 the next.
+    """
 
     def __init__(self, possible_rot: list[str], use_easter: bool = True):
+        if len(possible_rot) == 0:
+            raise ValueError("Rotation needs at least one possible family")
         self.possible = possible_rot
-        self.all_rotations: list[list[str]] = list(
-            itertools.permutations(self.possible)  # type: ignore
-        )
         self.use_easter = use_easter
 
+    def rotations(self) -> Iterator[list[str]]:
+        """Generate possible rotations one at a time, only ones with non consecutive same values, see cyclic_arrangements."""
+        return cyclic_arrangements(self.possible)
+
     def rotate(self, li: list[str], amount: int, left: bool = True) -> list[str]:
         """Rotate list by given number of elements in set direction."""
         rotate_by = amount % len(li)
@@ -102,21 +143,7 @@ class Rotation:
     @property
     def filter_rotations(self) -> list[list[str]]:
         """Filter out possible rotations, only include ones non consecutive same values."""
-        new_rotations = []
-        for rotation in self.all_rotations:
-            pass_val = False
-            for val1, val2 in zip(rotation, rotation[1:]):
-                if val1 == val2:
-                    pass_val = True
-                    break
-            rot_once = self.rotate(rotation, 1)
-            for val1, val2 in zip(rot_once, rot_once[1:]):
-                if val1 == val2:
-                    pass_val = True
-                    break
-            if not pass_val:
-                new_rotations.append(rotation)
-        return new_rotations
+        return list(self.rotations())
 
     def modified_rotation(
         self,
@@ -129,34 +156,84 @@ class Rotation:
             our_year_dict = our_year.__dict__
             their_year_dict = their_year.__dict__
             ours_swaps = {val: key for key, val in our_year_dict.items()}
+            if any(family not in ours_swaps for family in target_families):
+                continue
             our_holidays = [ours_swaps[family] for family in target_families]
             for hol, other_val in zip(our_holidays, target_families[::-1]):
                 if their_year_dict[hol] == other_val:
                     setattr(our_year, hol, other_val)
         return ours
 
+    def rotation_couple(
+        self, rotation: list[str], orient: int, num_years: int
+    ) -> Couple:
+        """Couple starting at given rotation then rotating one element each year in direction of orient, holiday j in year i is rotation[(j + i * orient) % len(rotation)]."""
+        return Couple(
+            [
+                Year(
+                    *[
+                        rotation[(j + i * orient) % len(rotation)]
+                        for j in range(len(HOLIDAYS))
+                    ],
+                    str(2022 + i),
+                )
+                for i in range(num_years)
+            ]
+        )
+
+    def rotation_matches(
+        self, rotations: list[list[str]], couples: list[Couple]
+    ) -> np.ndarray:
+        """Get number of common gatherings with all couples for every rotation and orientation -1, 1 in one comparison, shape (rotation, orientation).
+
+        Holidays are coded as ints, our holiday j in year i is rotation[(j + i * orient) % len(rotation)],
+        shorter couples are padded with -1 that never matches.
+        """
+        num_years = couples[0].num_years
+        num_holidays = len(HOLIDAYS)
+        codes: dict[str, int] = {}
+        rot_codes = np.array(
+            [
+                [codes.setdefault(val, len(codes)) for val in rotation]
+                for rotation in rotations
+            ]
+        )
+        theirs = np.full((len(couples), num_years * num_holidays), -1)
+        for couple_idx, couple in enumerate(couples):
+            holidays = couple.all_holidays[: num_years * num_holidays]
+            theirs[couple_idx, : len(holidays)] = [
+                codes.setdefault(val, len(codes)) for val in holidays
+            ]
+        theirs = theirs.reshape(len(couples), num_years, num_holidays)
+
+        orients = np.array([-1, 1])
+        shifted = (
+            np.arange(num_holidays)[None, None, :]
+            + np.arange(num_years)[None, :, None] * orients[:, None, None]
+        ) % len(self.possible)
+        # (rotation, orientation, couple, year, holiday)
+        common = rot_codes[:, shifted][:, :, None] == theirs[None, None]
+        if not self.use_easter:
+            common = common[..., 1:]
+        return common.sum(axis=(2, 3, 4))
+
     def best_rotation(self, couples: list[Couple]) -> tuple[int, Couple]:
-        """Find optimal rotation that best matches given couple schedule, return couple for given rotation."""
-        max_num = 0
+        """Find optimal rotation that best matches given couple schedule, return couple for given rotation.
+
+        First rotation and orientation with most matches wins, if none match falls back to first couple.
+        """
         max_couple = couples[0]
-        for rotation in self.filter_rotations:
-            # try left and right rotations
-            for orient in [-1, 1]:
-                # Set couple to given intital orientation then rotate through one element at a time for given number of years
-                us = Couple(
-                    [
-                        Year(*self.rotate(rotation, i * orient), str(2022 + i))  # type: ignore
-                        for i in range(couples[0].num_years)
-                    ]
-                )
-                common_num = sum([us.common_all(couple) for couple in couples])
-                if not self.use_easter:
-                    common_num = sum(
-                        [us.common_all_minus_easter(couple) for couple in couples]
-                    )
-                if common_num > max_num:
-                    max_num = common_num
-                    max_couple = us
+        max_num, max_rotation = 0, None
+        rotations = self.rotations()
+        # try left and right rotations, a chunk of rotations at a time
+        while chunk := list(itertools.islice(rotations, ROTATION_CHUNK)):
+            common = self.rotation_matches(chunk, couples)
+            rot_idx, orient_idx = np.unravel_index(np.argmax(common), common.shape)
+            if common[rot_idx, orient_idx] > max_num:
+                max_num = common[rot_idx, orient_idx]
+                max_rotation = (chunk[rot_idx], [-1, 1][orient_idx])
+        if max_rotation is not None:
+            max_couple = self.rotation_couple(*max_rotation, couples[0].num_years)
 
         max_couple = self.modified_rotation(max_couple, couples[0])
         max_num = sum([max_couple.common_all(couple) for couple in couples])
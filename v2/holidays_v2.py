@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-import itertools
 from dataclasses import dataclass
+from functools import cached_property
+from typing import Iterator
 
 # Holiday Statuses
 GONE = "GONE"
@@ -9,6 +10,10 @@ GRESKO = "Gresko"
 PALOMBO = "Palombo"
 PENDOLA = "Pendola"
 
+# Holidays in order of Year fields and families counted in spreads
+HOLIDAYS = ["easter", "thanksgiving", "eve", "christmas"]
+FAMILIES = [GRESKO, PALOMBO, PENDOLA]
+
 
 @dataclass
 class Year:
@@ -58,33 +63,151 @@ class Couple:
         return sum(all_holidays, [])
 
 
+def multiset_permutations(items: list[str], length: int) -> Iterator[list[str]]:
+    """Distinct orderings of length items picked from items, never making duplicates when items repeat.
+
+    Each position tries each distinct value once, as the same value again would give the same orderings of the rest.
+    Orderings come in the order they first appear in itertools.permutations(items, length).
+    e.g. [G, G, Pa] length 2 gives [G, G], [G, Pa], [Pa, G]
+    """
+    if length == 0:
+        yield []
+        return
+    seen = set()
+    for idx, item in enumerate(items):
+        if item in seen:
+            continue
+        seen.add(item)
+        for rest in multiset_permutations(items[:idx] + items[idx + 1 :], length - 1):
+            yield [item, *rest]
+
+
+def unevenness(freq: list[int]) -> int:
+    """How far counts are above their minimum, summed, e.g. [3,2,4,5] is 1+0+2+3 = 6."""
+    return sum(freq) - min(freq) * len(freq)
+
+
+# Spread counts per holiday then family, in HOLIDAYS and FAMILIES order, shifted so the least count is 0
+SpreadState = tuple[tuple[int, ...], ...]
+
+
+def spread_state(holiday_spread: dict[str, dict[str, int]]) -> SpreadState:
+    """Spread counts as state, shifting all counts by the same amount leaves every spread metric the same."""
+    least = min(min(counts.values()) for counts in holiday_spread.values())
+    return tuple(
+        tuple(holiday_spread[holiday][family] - least for family in FAMILIES)
+        for holiday in HOLIDAYS
+    )
+
+
+def state_metric(state: SpreadState) -> int:
+    """Spread metric of optimize_spread for state, unevenness of each family over holidays plus each holiday over families."""
+    return sum(unevenness(list(counts)) for counts in state) + sum(
+        unevenness(list(counts)) for counts in zip(*state)
+    )
+
+
+class Lookahead:
+    """Finds schedule starting the best run of next years instead of best single year, each run scored as sum of optimize_spread metric of its years.
+
+    Best runs are memoized on spread state, year index in cycle of match counts and depth,
+    so a state reached again at the same point of the siblings' cycle is not searched again.
+    """
+
+    def __init__(self, schedules: list[list[str]], year_matches: list[list[int]]):
+        """
+        Args:
+            schedules: possible schedules of each year
+            year_matches: total matches to other couples of each schedule, per year
+        """
+        self.cells = [
+            [
+                (holiday_idx, FAMILIES.index(family))
+                for holiday_idx, family in enumerate(schedule)
+            ]
+            for schedule in schedules
+        ]
+        self.year_matches = year_matches
+        num_years = len(year_matches)
+        # Cycle of 1 if there are no years
+        self.cycle = next(
+            (
+                period
+                for period in range(1, num_years + 1)
+                if all(
+                    year_matches[idx] == year_matches[idx + period]
+                    for idx in range(num_years - period)
+                )
+            ),
+            1,
+        )
+        self.memo: dict[tuple[SpreadState, int, int], tuple[int, int]] = {}
+
+    def add(self, state: SpreadState, sched_idx: int) -> SpreadState:
+        """State after schedule of index is added as next year."""
+        counts = [list(holiday_counts) for holiday_counts in state]
+        for holiday_idx, family_idx in self.cells[sched_idx]:
+            counts[holiday_idx][family_idx] += 1
+        least = min(min(holiday_counts) for holiday_counts in counts)
+        return tuple(
+            tuple(count - least for count in holiday_counts)
+            for holiday_counts in counts
+        )
+
+    def best(self, state: SpreadState, year_idx: int, depth: int) -> tuple[int, int]:
+        """Least total metric of next depth years from state, stopping at last year, and index of first schedule of it, first one on ties."""
+        depth = min(depth, len(self.year_matches) - year_idx)
+        key = (state, year_idx % self.cycle, depth)
+        if key not in self.memo:
+            totals = []
+            for sched_idx, match in enumerate(self.year_matches[year_idx]):
+                next_state = self.add(state, sched_idx)
+                total = -10 * match + state_metric(next_state)
+                if depth > 1:
+                    total += self.best(next_state, year_idx + 1, depth - 1)[0]
+                totals.append(total)
+            least = min(totals)
+            self.memo[key] = (least, totals.index(least))
+        return self.memo[key]
+
+
 class Schedule:
     """Holds possible scheduless for main couple when compared to other couple schedule."""
 
     def __init__(self, possible: list[str]):
+        """Schedules fill every holiday of Year with families of possible, each in FAMILIES.
+
+        Raises ValueError if a family is not in FAMILIES or possible is too short to fill all holidays, as missing holidays are filled from possible again.
+        """
+        unknown = [family for family in possible if family not in FAMILIES]
+        if len(unknown) > 0:
+            raise ValueError(
+                f"Possible families {', '.join(unknown)} not in {', '.join(FAMILIES)}"
+            )
+        if 2 * len(possible) < len(HOLIDAYS):
+            raise ValueError(
+                f"Need at least {(len(HOLIDAYS) + 1) // 2} possible families to fill {len(HOLIDAYS)} holidays, got {len(possible)}"
+            )
         self.possible = possible
         self.schedule_by_year: dict[str, Year] = {}
+        self._holiday_spread, self._family_spread = self.calculate_spread({})
+        self._spread_metric = 0
 
-    @property
+    @cached_property
     def all_schedules(self) -> list[list[str]]:
-        """Get all possible combinations of schedules given families and holidays. If less length, get combos of known, then combos of missing and combine."""
-        if len(self.possible) < 4:
-            missing_sched = 4 - len(self.possible)
-            known_perms = list(itertools.permutations(self.possible))
-            fill_perms = list(itertools.permutations(self.possible, missing_sched))
-            possible_list = [
-                known + fill for fill in fill_perms for known in known_perms
-            ]
-        else:
-            possible_list = [
-                possible[:4] for possible in itertools.permutations(self.possible)
+        """Get all possible combinations of schedules given families and holidays. If less length, get combos of known, then combos of missing and combine.
+
+        Made once per schedule, each combination once even when families repeat in possible.
+        """
+        if len(self.possible) < len(HOLIDAYS):
+            missing_sched = len(HOLIDAYS) - len(self.possible)
+            known_perms = list(multiset_permutations(self.possible, len(self.possible)))
+            return [
+                known + fill
+                for fill in multiset_permutations(self.possible, missing_sched)
+                for known in known_perms
             ]
-
-        unique_possible_list = []
-        for possible in possible_list:
-            if possible not in unique_possible_list:
-                unique_possible_list.append(list(possible))
-        return unique_possible_list
+        return list(multiset_permutations(self.possible, len(HOLIDAYS)))
 
     def get_matches(self, schedule: list[str], couple: Couple, year: str) -> int:
         """get number of matches between our schedule"""
@@ -108,8 +231,8 @@ class Schedule:
         """Calculate occurance dictionaries indexed by holiday then family per holiday, also holiday and holiday per family."""
         holiday_spread: dict[str, dict[str, int]] = {}
         family_spread: dict[str, dict[str, int]] = {}
-        holidays = ["easter", "thanksgiving", "eve", "christmas"]
-        families = [GRESKO, PALOMBO, PENDOLA]
+        holidays = HOLIDAYS
+        families = FAMILIES
         for default_holiday in holidays:
             if default_holiday not in holiday_spread:
                 holiday_spread[default_holiday] = {}
@@ -133,11 +256,48 @@ class Schedule:
 
     @property
     def holiday_spread(self) -> dict[str, dict[str, int]]:
-        return self.calculate_spread(self.schedule_by_year)[0]
+        return {
+            holiday: dict(counts) for holiday, counts in self._holiday_spread.items()
+        }
 
     @property
     def family_spread(self) -> dict[str, dict[str, int]]:
-        return self.calculate_spread(self.schedule_by_year)[1]
+        return {family: dict(counts) for family, counts in self._family_spread.items()}
+
+    def _count_year(self, schedule: list[str], step: int) -> None:
+        """Add step to running spread counts for each holiday of year schedule, then update spread metric of all years."""
+        for holiday, family in zip(HOLIDAYS, schedule):
+            self._holiday_spread[holiday][family] += step
+            self._family_spread[family][holiday] += step
+        self._spread_metric = sum(
+            unevenness(list(counts.values()))
+            for counts in [
+                *self._family_spread.values(),
+                *self._holiday_spread.values(),
+            ]
+        )
+
+    def spread_metric(self, schedule: list[str]) -> int:
+        """Spread metric of optimize_spread for the years so far plus schedule as next year.
+
+        Starts from metric of running counts and only recomputes the rows schedule adds to, each holiday's row and each family's row it uses,
+        so cost does not grow with number of years.
+        """
+        metric = self._spread_metric
+        for holiday, family in zip(HOLIDAYS, schedule):
+            counts = self._holiday_spread[holiday]
+            metric += unevenness(
+                [count + (fam == family) for fam, count in counts.items()]
+            ) - unevenness(list(counts.values()))
+        for family in set(schedule):
+            counts = self._family_spread[family]
+            metric += unevenness(
+                [
+                    count + (sched_family == family)
+                    for count, sched_family in zip(counts.values(), schedule)
+                ]
+            ) - unevenness(list(counts.values()))
+        return metric
 
     def optimize_spread(
         self, schedules: list[list[str]], matches: list[int]
@@ -145,40 +305,21 @@ class Schedule:
         """Optimize year by year best schedule by # of matches to relatives and spread of holidays between families."""
         metrics = []
         for schedule, match in zip(schedules, matches):
-            possible_schedule = self.schedule_by_year.copy()
-            possible_schedule["next"] = Year(*schedule)
-            holiday_spread, family_spread = self.calculate_spread(possible_schedule)
-
+            # Spread metric is sum of these 2 scores, from running counts with schedule added, see spread_metric
             # Score per family of difference of # min occurances of holiday compared to other holidays for the family
             # Higher this is, more uneven of some families only getting some holidays
             # e.g family= Gresko, ea,th,eve,chr occur = [3,2,4,5] score = sum([3,2,4,5] - 2) = sum(1,0,2,3) = 6, score+=6, next family
-            family_across_holiday_metric = 0
-            for holiday_dict in family_spread.values():
-                family_freq = list(holiday_dict.values())
-                family_across_holiday_metric += sum(family_freq) - min(
-                    family_freq
-                ) * len(family_freq)
-
-            # Score per holiday of difference of # min occurances of family compared to other families for the holiday
-            # Higher this is, more uneven of different families dominate different holidays
-            # e.g. holiday = eve, gre,pa,pe occur = [6,4,2] socre = sum([6,4,2] - 20 = sum(4,2,0) = 6, score +=6 next holiday
-            family_per_holiday_metric = 0
-            for family_dict in holiday_spread.values():
-                holiday_freq = list(family_dict.values())
-                family_per_holiday_metric += sum(holiday_freq) - min(
-                    holiday_freq
-                ) * len(holiday_freq)
-
             # Score accounts # of matches most heavily, then spread of holidays per fam and spread of families per holiday weighed equally
-            metrics.append(
-                -10 * match + family_per_holiday_metric + family_across_holiday_metric
-            )
+            metrics.append(-10 * match + self.spread_metric(schedule))
         min_index = metrics.index(min(metrics))
         return schedules[min_index]
 
     def add_year(self, schedule: list[str], year: str):
-        """Append best schedule for given year to overall schedule dict."""
+        """Append best schedule for given year to overall schedule dict and running spread counts."""
+        if year in self.schedule_by_year:
+            self._count_year(self.schedule_by_year[year].list, -1)
         self.schedule_by_year[year] = Year(*schedule)
+        self._count_year(schedule, 1)
 
     def best_year_by_year(self, couples: list[Couple], year: str) -> list[str]:
         """Get best schedule for given year, calculating matches that year then optimizing based on that and existing holiday spread."""
@@ -192,11 +333,30 @@ class Schedule:
         )
         return optimal_schedule
 
-    def calc_best_schedule(self, couples: list[Couple]):
-        """Calculate best schedule over all years for couple"""
+    def calc_best_schedule(self, couples: list[Couple], depth: int = 1):
+        """Calculate best schedule over all years for couple
+
+        Depth above 1 picks each year the schedule starting the best run of the next depth years, see Lookahead, 1 is best year by year.
+        """
         years = couples[0].years
-        for year in years:
-            self.add_year(self.best_year_by_year(couples, year), year)
+        if depth <= 1:
+            for year in years:
+                self.add_year(self.best_year_by_year(couples, year), year)
+            return
+        lookahead = Lookahead(
+            self.all_schedules,
+            [
+                [
+                    sum(self.get_matches(schedule, couple, year) for couple in couples)
+                    for schedule in self.all_schedules
+                ]
+                for year in years
+            ],
+        )
+        for year_idx, year in enumerate(years):
+            state = spread_state(self._holiday_spread)
+            sched_idx = lookahead.best(state, year_idx, depth)[1]
+            self.add_year(self.all_schedules[sched_idx], year)
 
 
 def main():
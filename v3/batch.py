@@ -0,0 +1,37 @@
+import argparse
+import time
+from pathlib import Path
+
+from holidays.batch import export_batch, read_households, schedule_batch
+
+
+def main() -> None:
+    """Schedule every household of batch csv over worker pool into one combined schedule csv with per household timing stats."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("input", type=Path, help="Batch csv of household problems.")
+    parser.add_argument(
+        "--out",
+        type=Path,
+        default=Path(__file__).parent / "data" / "batch_schedule.csv",
+    )
+    parser.add_argument(
+        "--stats", type=Path, default=Path(__file__).parent / "data" / "batch_stats.csv"
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    households = read_households(args.input)
+    read = time.perf_counter()
+    num_households, schedule_seconds = export_batch(
+        schedule_batch(households, max_workers=args.workers), args.out, args.stats
+    )
+    end = time.perf_counter()
+    print(
+        f"{num_households} households read in {read - start:.2f}s, scheduled in {end - read:.2f}s "
+        f"({num_households / (end - read) * 60:.0f} per minute, {schedule_seconds / max(num_households, 1) * 1e3:.2f}ms each)"
+    )
+
+
+if __name__ == "__main__":
+    main()
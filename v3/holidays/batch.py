@@ -0,0 +1,264 @@
+import csv
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from holidays.constants import Couples, Families, Holidays, Status
+from holidays.funcs import enum_lookup
+from holidays.place import Place
+from holidays.pool import run_pool
+from holidays.report import Report
+from holidays.rotation import Rotation
+from holidays.schedule import Scheduler
+from holidays.table import PlaceTable
+
+# Columns of batch input, each row is one record of a household of given kind, unused columns left blank.
+# config: couple is main couple, year is start year, value is num years
+# rotation: couple, cycle is year in their rotation, holiday, family
+# dist: family, value is target share
+# weight: couple, value is sibling weight
+# history: year, couple, holiday, family
+BATCH_COLUMNS = [
+    "household",
+    "kind",
+    "couple",
+    "cycle",
+    "year",
+    "holiday",
+    "family",
+    "value",
+]
+
+
+@dataclass
+class Household:
+    """Scheduling problem of one household, the inputs of a Scheduler."""
+
+    name: str
+    couple: Optional[Couples] = None
+    start_year: int = 0
+    num_years: int = 0
+    fam_prime_dist: Dict[Families, float] = field(default_factory=dict)
+    sib_weights: Dict[Couples, float] = field(default_factory=dict)
+    rotation_holidays: Dict[Couples, Dict[int, Dict[Holidays, Families]]] = field(
+        default_factory=dict
+    )
+    history: PlaceTable = field(default_factory=PlaceTable)
+
+    @property
+    def rotations(self) -> Dict[Couples, List[Rotation]]:
+        """Rotation of each other couple in cycle order."""
+        rotations = {}
+        for couple, cycles in self.rotation_holidays.items():
+            rotations[couple] = []
+            for cycle in sorted(cycles):
+                holiday_family = cycles[cycle]
+                missing = [
+                    holiday for holiday in Holidays if holiday not in holiday_family
+                ]
+                if len(missing) > 0:
+                    raise ValueError(
+                        f"Household {self.name} {couple.value} rotation {cycle} missing {', '.join(hol.value for hol in missing)}"
+                    )
+                rotations[couple].append(
+                    Rotation(
+                        easter=holiday_family[Holidays.EASTER],
+                        thanks=holiday_family[Holidays.THANKSGIVING],
+                        eve=holiday_family[Holidays.EVE],
+                        christmas=holiday_family[Holidays.CHRISTMAS],
+                    )
+                )
+        return rotations
+
+
+@dataclass
+class HouseholdResult:
+    """Scheduled places of couple for a household with timing of each step in seconds."""
+
+    name: str
+    places: PlaceTable
+    match_percent: Dict[Couples, float]
+    setup_seconds: float
+    schedule_seconds: float
+    report_seconds: float
+
+    @property
+    def total_seconds(self) -> float:
+        """Time of all steps."""
+        return self.setup_seconds + self.schedule_seconds + self.report_seconds
+
+
+def read_households(csv_path: Path) -> List[Household]:
+    """Read all households from batch csv, rows of a household do not need to be together.
+
+    Raises ValueError with line number for unknown kind or names, and naming the household if it misses its config row,
+    a dist row for a family or a weight row for a couple in its rotations or history.
+    """
+    couples = enum_lookup(Couples)
+    holidays = enum_lookup(Holidays)
+    families = enum_lookup(Families)
+    households: Dict[str, Household] = {}
+    with open(csv_path, newline="") as csv_file:
+        reader = csv.DictReader(csv_file)
+        missing = [col for col in BATCH_COLUMNS if col not in (reader.fieldnames or [])]
+        if len(missing) > 0:
+            raise ValueError(f"{csv_path} missing columns {', '.join(missing)}")
+        for row in reader:
+            try:
+                household = households.setdefault(
+                    row["household"], Household(name=row["household"])
+                )
+                kind = row["kind"].strip().lower()
+                if kind == "config":
+                    household.couple = couples[row["couple"].upper()]
+                    household.start_year = int(row["year"])
+                    household.num_years = int(float(row["value"]))
+                elif kind == "rotation":
+                    cycles = household.rotation_holidays.setdefault(
+                        couples[row["couple"].upper()], {}
+                    )
+                    cycles.setdefault(int(row["cycle"]), {})[
+                        holidays[row["holiday"].upper()]
+                    ] = families[row["family"].upper()]
+                elif kind == "dist":
+                    household.fam_prime_dist[families[row["family"].upper()]] = float(
+                        row["value"]
+                    )
+                elif kind == "weight":
+                    household.sib_weights[couples[row["couple"].upper()]] = float(
+                        row["value"]
+                    )
+                elif kind == "history":
+                    household.history.append(
+                        Place(
+                            year=int(row["year"]),
+                            couple=couples[row["couple"].upper()],
+                            holiday=holidays[row["holiday"].upper()],
+                            family=families[row["family"].upper()],
+                            status=Status.PRIMARY,
+                        )
+                    )
+                else:
+                    raise ValueError(f"unknown kind {row['kind']}")
+            except (KeyError, ValueError, AttributeError) as err:
+                raise ValueError(
+                    f"{csv_path} line {reader.line_num}: invalid row {row}: {err}"
+                ) from err
+    for household in households.values():
+        if household.couple is None:
+            raise ValueError(f"Household {household.name} has no config row")
+        missing_dist = [
+            family
+            for family in Families
+            if family is not Families.GONE and family not in household.fam_prime_dist
+        ]
+        if len(missing_dist) > 0:
+            raise ValueError(
+                f"Household {household.name} missing dist rows for {', '.join(fam.value for fam in missing_dist)}"
+            )
+        sibs = set(household.rotation_holidays) | {
+            place.couple for place in household.history
+        }
+        sibs.discard(household.couple)
+        missing_weight = [
+            couple
+            for couple in Couples
+            if couple in sibs and couple not in household.sib_weights
+        ]
+        if len(missing_weight) > 0:
+            raise ValueError(
+                f"Household {household.name} missing weight rows for {', '.join(couple.value for couple in missing_weight)}"
+            )
+    return list(households.values())
+
+
+def schedule_household(household: Household) -> HouseholdResult:
+    """Schedule one household and measure it."""
+    start = time.perf_counter()
+    assert household.couple is not None
+    scheduler = Scheduler(
+        couple=household.couple,
+        start_year=household.start_year,
+        num_years=household.num_years,
+        fam_prime_dist=household.fam_prime_dist,
+        sib_weights=household.sib_weights,
+        rotations=household.rotations,
+        history=household.history,
+    )
+    scheduled = time.perf_counter()
+    scheduler.schedule()
+    reported = time.perf_counter()
+    report = Report(scheduler.all_places(), household.couple)
+    end = time.perf_counter()
+    return HouseholdResult(
+        name=household.name,
+        places=scheduler.scheduled_places(),
+        match_percent=report.match_percent,
+        setup_seconds=scheduled - start,
+        schedule_seconds=reported - scheduled,
+        report_seconds=end - reported,
+    )
+
+
+def schedule_batch(
+    households: List[Household], max_workers: Optional[int] = None
+) -> Iterator[HouseholdResult]:
+    """Schedule every household over process pool, results yielded in same order as households."""
+    yield from run_pool(schedule_household, households, max_workers=max_workers)
+
+
+def export_batch(
+    results: Iterable[HouseholdResult], csv_path: Path, stats_path: Path
+) -> Tuple[int, float]:
+    """Stream scheduled places of every household to one csv and timing of each household to stats csv.
+
+    Returns number of households and their total scheduling seconds.
+    """
+    num_households = 0
+    total_seconds = 0.0
+    with open(csv_path, "w", newline="") as csv_file, open(
+        stats_path, "w", newline=""
+    ) as stats_file:
+        writer = csv.writer(csv_file)
+        stats_writer = csv.writer(stats_file)
+        writer.writerow(["household", "year", "couple", "holiday", "family"])
+        stats_writer.writerow(
+            [
+                "household",
+                "places",
+                "setup_seconds",
+                "schedule_seconds",
+                "report_seconds",
+                "total_seconds",
+                "match_percent",
+            ]
+        )
+        for result in results:
+            writer.writerows(
+                [
+                    result.name,
+                    place.year,
+                    place.couple.value,
+                    place.holiday.value,
+                    place.family.value,
+                ]
+                for place in result.places
+            )
+            stats_writer.writerow(
+                [
+                    result.name,
+                    len(result.places),
+                    f"{result.setup_seconds:.6f}",
+                    f"{result.schedule_seconds:.6f}",
+                    f"{result.report_seconds:.6f}",
+                    f"{result.total_seconds:.6f}",
+                    " ".join(
+                        f"{couple.value}={percent:.2f}"
+                        for couple, percent in result.match_percent.items()
+                    ),
+                ]
+            )
+            num_households += 1
+            total_seconds += result.total_seconds
+    return num_households, total_seconds
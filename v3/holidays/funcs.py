@@ -1,150 +1,155 @@
+import csv
+import io
+from collections import Counter
+from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Type, TypeVar
 
-import pandas as pd  # type: ignore
 from holidays.constants import Couples, Families, Holidays, Status
 from holidays.place import Place, PrimeSec
+from holidays.report import Report
+from holidays.table import (
+    COUPLE_CODES,
+    FAMILIES,
+    FAMILY_CODES,
+    HOLIDAY_CODES,
+    STATUS_CODES,
+    PlaceTable,
+)
+
+EnumType = TypeVar("EnumType", bound=Enum)
 
 
 def couple_holiday_count(
-    places: List[Place], couple: Couples, holiday: Optional[Holidays] = None
+    places: Iterable[Place], couple: Couples, holiday: Optional[Holidays] = None
 ) -> Dict[Families, PrimeSec]:
     """Make count mapping of number of times a given couple visits each family primary/secondary.
 
     If holiday specified, only gives counts for holiday, else do all holidays.
+    Counts pairs of family and status codes of the filtered table at once, families in order first visited.
 
     e.g Us visit palombo 1 prime 2 sec, pendola 2 prime 1 sec gresko 3 prime 2 sec.
     """
-    couple_places = [place for place in places if place.couple == couple]
-    if holiday is not None:
-        couple_places = [place for place in couple_places if place.holiday == holiday]
+    couple_table = PlaceTable.from_places(places).where(couple=couple, holiday=holiday)
+    primary = STATUS_CODES[Status.PRIMARY]
     place_count: Dict[Families, PrimeSec] = {}
-    for place in couple_places:
-        if place.family not in place_count:
-            place_count[place.family] = PrimeSec()
-        if place.status == Status.PRIMARY:
-            place_count[place.family].add_prime()
+    for (family_code, status_code), count in Counter(
+        zip(couple_table.family, couple_table.status)
+    ).items():
+        family = FAMILIES[family_code]
+        if family not in place_count:
+            place_count[family] = PrimeSec()
+        if status_code == primary:
+            place_count[family].primary += count
         else:
-            place_count[place.family].add_sec()
+            place_count[family].secondary += count
     return place_count
 
 
-def sibling_match_count(places: List[Place], couple: Couples) -> Dict[Couples, int]:
+def sibling_match_count(places: Iterable[Place], couple: Couples) -> Dict[Couples, int]:
     """Checks for each other couple, how many times the main couple is at the sample place as them.
 
-    Loops through all other places and then looks at all main couple places.
-    If there is a main couple place that matches the other place, add to count for other couple, then move not next other place.
+    Hash join on year, holiday and family: count main couple places per key,
+    then for each other place in order add the count of main couple places at its key to the other couple.
 
     Args:
-        places (List[Place]): Places visited by main couple in question and others.
+        places (Iterable[Place]): Places visited by main couple in question and others.
 
     Returns:
         Dict[Couples, int]: Mapping of other couples to number of matches where other couple's place is same as main couple.
     """
-    couple_places = [place for place in places if place.couple == couple]
-    other_places = [place for place in places if place.couple != couple]
-    match_count = {}
-    for other_place in other_places:
-        for couple_place in couple_places:
-            if other_place.same_place(couple_place):
-                if other_place.couple not in match_count:
-                    match_count[other_place.couple] = 0
-                match_count[other_place.couple] += 1
+    couple_keys: Counter = Counter()
+    other_keys = []
+    for place in places:
+        key = (place.year, place.holiday, place.family)
+        if place.couple == couple:
+            couple_keys[key] += 1
+        else:
+            other_keys.append((place.couple, key))
+    match_count: Dict[Couples, int] = {}
+    for other_couple, key in other_keys:
+        count = couple_keys.get(key, 0)
+        if count == 0:
+            continue
+        match_count[other_couple] = match_count.get(other_couple, 0) + count
 
     return match_count
 
 
-def num_available(places: List[Place], couple: Couples) -> int:
+def num_available(places: Iterable[Place], couple: Couples) -> int:
     """Calculates the number of times the couple is not GONE and available to be matched with for all place objects."""
-    return len(
-        [
-            place
-            for place in places
-            if place.family != Families.GONE and place.couple == couple
-        ]
-    )
-
-
-def print_results(places: List[Place], main_couple: Couples) -> str:
-    """Printable results based on schedule, including metrics."""
-    print_str = "RESULTS\n\n"
-    min_year = min(place.year for place in places)
-    max_year = max(place.year for place in places)
-
-    for year in range(min_year, max_year + 1):
-        for holiday in Holidays:
-            our_place = [
-                place
-                for place in places
-                if place.couple == main_couple
-                and place.year == year
-                and place.holiday == holiday
-            ]
-            other_places = [
-                place
-                for place in places
-                if place.couple != main_couple
-                and place.year == year
-                and place.holiday == holiday
-            ]
-            other_fam_str = "|".join(
-                f"{place.couple.value:^8}|{place.family.value:^10}"
-                for place in other_places
-            )
-            print_str += f"|{year:^3}|{holiday.value:^15}|{our_place[0].couple.value:^2}|{our_place[0].family.value:^10}|{other_fam_str}|\n"
-    print_str += "\n"
-
-    match_count = sibling_match_count(places, couple=main_couple)
-    for couple, count in match_count.items():
-        couple_avail = num_available(places, couple)
-        if couple == main_couple:
-            continue
-        print_str += f"| {couple.value:^8} | Availble | {couple_avail} | Match | {count} | Percent | {count/couple_avail*100:.2f}% |\n"
-    print_str += "\n"
-
-    for holiday in Holidays:
-        hol_spread = couple_holiday_count(places, main_couple, holiday=holiday)
-        hol_str = "".join(
-            [
-                f"{family.value:^7}|{hol_spread[family].primary:^3}|"
-                for family in Families
-                if family is not Families.GONE
-            ]
-        )
-        print_str += f"|{holiday.value:^15}|{hol_str}\n"
-    all_spread = couple_holiday_count(places, main_couple)
-    all_str = "".join(
-        [
-            f"{family.value:^7}|{all_spread[family].primary:^3}|"
-            for family in Families
-            if family is not Families.GONE
-        ]
-    )
-    print_str += f"|      All      |{all_str}\n"
+    couple_table = PlaceTable.from_places(places).where(couple=couple)
+    return len(couple_table) - couple_table.family.count(FAMILY_CODES[Families.GONE])
+
+
+def print_results(places: Iterable[Place], main_couple: Couples) -> str:
+    """Printable results based on schedule, including metrics. Use Report.write to stream to a file instead."""
+    out = io.StringIO()
+    Report(places, main_couple).write(out)
+    return out.getvalue()
 
-    return print_str
 
+def enum_lookup(enum: Type[EnumType]) -> Dict[str, EnumType]:
+    """Mapping of upper case name and value of each member to member, for case-insensitive lookup of either."""
+    lookup = {member.name.upper(): member for member in enum}
+    lookup.update({str(member.value).upper(): member for member in enum})
+    return lookup
 
-def import_places(csv_path: Path) -> List[Place]:
-    """Given csv, import to get list of place objects.
 
-    CSV has year header int, couple holiday family headers with strings that match values of corresponding structs case-insensitive.
+def import_places(csv_path: Path, start: int = 0) -> PlaceTable:
+    """Given csv, import to get table of places.
+
+    CSV has year header int, couple holiday family headers with strings that match names or values of corresponding structs case-insensitive.
+    Rows are streamed and each string mapped straight to its enum code, all invalid rows are reported with line number in one ValueError.
+    start is a byte offset at the start of a row to read rows from after the header, e.g. size of the file when rows were last read,
+    line numbers are then counted from there.
     """
-    pd_csv = pd.read_csv(csv_path)
-    return [
-        Place(
-            year=row["year"],
-            couple=Couples.__dict__[row["couple"].upper()],
-            holiday=Holidays.__dict__[row["holiday"].upper()],
-            family=Families.__dict__[row["family"].upper()],
-            status=Status.PRIMARY,
-        )
-        for _, row in pd_csv.iterrows()
-    ]
-
-
-def export_csv(places: List[Place], csv_path: Path) -> None:
+    couple_codes = {
+        name: COUPLE_CODES[couple] for name, couple in enum_lookup(Couples).items()
+    }
+    holiday_codes = {
+        name: HOLIDAY_CODES[holiday] for name, holiday in enum_lookup(Holidays).items()
+    }
+    family_codes = {
+        name: FAMILY_CODES[family] for name, family in enum_lookup(Families).items()
+    }
+    primary = STATUS_CODES[Status.PRIMARY]
+    table = PlaceTable()
+    errors = []
+    with open(csv_path, newline="") as csv_file:
+        reader = csv.DictReader(csv_file)
+        missing = [
+            col
+            for col in ("year", "couple", "holiday", "family")
+            if col not in (reader.fieldnames or [])
+        ]
+        if len(missing) > 0:
+            raise ValueError(f"{csv_path} missing columns {', '.join(missing)}")
+        if start > 0:
+            csv_file.seek(start)
+        for row in reader:
+            try:
+                year = int(row["year"])
+                couple = couple_codes[row["couple"].upper()]
+                holiday = holiday_codes[row["holiday"].upper()]
+                family = family_codes[row["family"].upper()]
+            except (KeyError, ValueError, AttributeError) as err:
+                errors.append(f"line {reader.line_num}: {err!r} in {row}")
+                continue
+            table.year.append(year)
+            table.couple.append(couple)
+            table.holiday.append(holiday)
+            table.family.append(family)
+            table.status.append(primary)
+    if len(errors) > 0:
+        raise ValueError(f"{csv_path} has invalid rows\n" + "\n".join(errors))
+    return table
+
+
+def export_csv(places: Iterable[Place], csv_path: Path) -> None:
     """Export list of places to csv. If year just use int, else get value from enum type."""
+    import pandas as pd  # type: ignore
+
     pd_dict: Dict[str, List[str]] = {
         "year": [],
         "couple": [],
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, Iterator, Tuple
+
+from holidays.constants import Couples, Families, Holidays
+from holidays.place import Place
+
+
+class PlaceIndex:
+    """Index of places by year, holiday and family to the number of places of each couple there.
+
+    Couples at the same key are at the same place, so matches between couples are lookups instead of comparing every pair of places.
+
+    e.g. index[(2023, Holidays.EASTER, Families.GRESKO)] = {Couples.US: 1, Couples.JAMES: 1} means Us and James match that easter.
+    """
+
+    def __init__(self) -> None:
+        self._index: Dict[Tuple[int, Holidays, Families], Dict[Couples, int]] = {}
+
+    @classmethod
+    def from_places(cls, places: Iterable[Place]) -> PlaceIndex:
+        """Make index of all places."""
+        index = cls()
+        for place in places:
+            index.add(place)
+        return index
+
+    def add(self, place: Place) -> None:
+        """Add place to count of its couple at its year holiday and family."""
+        key = (place.year, place.holiday, place.family)
+        couple_count = self._index.setdefault(key, {})
+        couple_count[place.couple] = couple_count.get(place.couple, 0) + 1
+
+    def remove(self, place: Place) -> None:
+        """Remove place from count of its couple, counts and keys reaching zero are dropped as if place was never added."""
+        key = (place.year, place.holiday, place.family)
+        couple_count = self._index[key]
+        couple_count[place.couple] -= 1
+        if couple_count[place.couple] == 0:
+            del couple_count[place.couple]
+            if len(couple_count) == 0:
+                del self._index[key]
+
+    def items(
+        self,
+    ) -> Iterator[Tuple[Tuple[int, Holidays, Families], Dict[Couples, int]]]:
+        """Each year holiday and family key with count of each couple there, in order added."""
+        return iter(self._index.items())
+
+    def set_counts(
+        self, year: int, holiday: Holidays, family: Families, counts: Dict[Couples, int]
+    ) -> None:
+        """Set count of each couple at year holiday and family, e.g. restoring a saved index."""
+        self._index[(year, holiday, family)] = dict(counts)
+
+    def couples_at(
+        self, year: int, holiday: Holidays, family: Families
+    ) -> Dict[Couples, int]:
+        """Number of places of each couple at family for year and holiday."""
+        return self._index.get((year, holiday, family), {})
+
+    def match_count(self, couple: Couples) -> Dict[Couples, int]:
+        """For each other couple, how many times the couple is at the same place as them.
+
+        Each pair of places at the same key is a match, so matches at a key are couple count times other couple count.
+        """
+        match_count: Dict[Couples, int] = {}
+        for couple_count in self._index.values():
+            count = couple_count.get(couple, 0)
+            if count == 0:
+                continue
+            for other, other_count in couple_count.items():
+                if other == couple:
+                    continue
+                match_count[other] = match_count.get(other, 0) + other_count * count
+        return match_count
@@ -0,0 +1,330 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from holidays.constants import Couples, Families, Holidays, Status
+from holidays.place import Place
+from holidays.pool import SharedPool, num_workers
+from holidays.report import Report
+from holidays.rotation import Rotation
+from holidays.schedule import Scheduler
+from holidays.table import HOLIDAY_CODES, PlaceTable
+
+# Family of couple for each holiday in Holidays order, for each year from start year.
+CoupleSchedule = List[List[Families]]
+
+
+@dataclass
+class JointCouple:
+    """Goals of one couple in a joint schedule.
+
+    Parameters
+    ----------
+
+    couple: Couples
+        Couple to schedule.
+    fam_prime_dist: Dict[Families, float]
+        Target distribution of couple's holidays over families, every family couple has been at in history included.
+    sib_weights: Dict[Couples, float]
+        Importance of matching each other couple, couples left out have weight 0.
+    rotation: Optional[List[Rotation]]
+        Current rotation of couple, starting point of the solver, holidays it is GONE stay GONE.
+        None to start from a greedy schedule against the others.
+    families: Optional[List[Families]]
+        Families couple can be at, defaults to families of fam_prime_dist.
+    """
+
+    couple: Couples
+    fam_prime_dist: Dict[Families, float]
+    sib_weights: Dict[Couples, float]
+    rotation: Optional[List[Rotation]] = None
+    families: Optional[List[Families]] = None
+
+
+@dataclass
+class JointProblem:
+    """Couples to schedule together over the same years and their shared history."""
+
+    start_year: int
+    num_years: int
+    couples: List[JointCouple]
+    history: PlaceTable = field(default_factory=PlaceTable)
+
+    @property
+    def years(self) -> range:
+        """Years to schedule."""
+        return range(self.start_year, self.start_year + self.num_years)
+
+    def goals(self, couple: Couples) -> JointCouple:
+        """Goals of couple."""
+        return next(goals for goals in self.couples if goals.couple == couple)
+
+
+@dataclass
+class JointResult:
+    """Schedules of every couple with score of each, and total score after each round, first is of the starting schedules."""
+
+    schedules: Dict[Couples, CoupleSchedule]
+    scores: Dict[Couples, float]
+    round_scores: List[float]
+
+
+@dataclass
+class _JointScheduler(Scheduler):
+    """Scheduler of one couple that keeps the couple GONE at given year and holidays instead of allocating them."""
+
+    gone: Set[Tuple[int, Holidays]] = field(default_factory=set)
+
+    def _schedule_year(self, year: int) -> None:
+        """Allocate every holiday of year the couple is not GONE."""
+        for holiday in Holidays:
+            if (year, holiday) in self.gone:
+                self._add_place(
+                    Place(
+                        year=year,
+                        couple=self.couple,
+                        holiday=holiday,
+                        family=Families.GONE,
+                        status=Status.PRIMARY,
+                    )
+                )
+            else:
+                self._add_place(self._attempt_allocation(year, holiday))
+
+
+def expand_rotation(
+    rotation: List[Rotation], start_year: int, num_years: int
+) -> CoupleSchedule:
+    """Schedule of rotation for each year, year uses rotation[year % len(rotation)] as in Scheduler."""
+    return [
+        [rotation[year % len(rotation)].dict()[holiday] for holiday in Holidays]
+        for year in range(start_year, start_year + num_years)
+    ]
+
+
+def schedule_rotation(schedule: CoupleSchedule, start_year: int) -> List[Rotation]:
+    """Schedule as a rotation as long as the schedule, placed so year start_year + i reads schedule[i] by year % len."""
+    num_years = len(schedule)
+    rotation: List[Optional[Rotation]] = [None] * num_years
+    for idx, families in enumerate(schedule):
+        holiday_family = dict(zip(Holidays, families))
+        rotation[(start_year + idx) % num_years] = Rotation(
+            easter=holiday_family[Holidays.EASTER],
+            thanks=holiday_family[Holidays.THANKSGIVING],
+            eve=holiday_family[Holidays.EVE],
+            christmas=holiday_family[Holidays.CHRISTMAS],
+        )
+    return [year_rotation for year_rotation in rotation if year_rotation is not None]
+
+
+def joint_places(
+    problem: JointProblem, schedules: Dict[Couples, CoupleSchedule]
+) -> Iterator[Place]:
+    """History then place of every couple for each scheduled year and holiday."""
+    yield from problem.history
+    for idx, year in enumerate(problem.years):
+        for hol_idx, holiday in enumerate(Holidays):
+            for couple, schedule in schedules.items():
+                yield Place(
+                    year=year,
+                    couple=couple,
+                    holiday=holiday,
+                    family=schedule[idx][hol_idx],
+                    status=Status.PRIMARY,
+                )
+
+
+def meet_percent(report: Report) -> Dict[Couples, float]:
+    """Percent of times each other couple is available that main couple is at the same family with them.
+
+    Unlike Report.match_percent both couples GONE is not a match, as nobody meets.
+    """
+    meet_count: Dict[Couples, int] = {}
+    for couple_families in report.groups.values():
+        main_families = Counter(
+            family
+            for family in couple_families.get(report.main_couple, [])
+            if family is not Families.GONE
+        )
+        if len(main_families) == 0:
+            continue
+        for couple, families in couple_families.items():
+            if couple == report.main_couple:
+                continue
+            for family in families:
+                meet_count[couple] = meet_count.get(couple, 0) + main_families[family]
+    return {
+        couple: count / report.available[couple] * 100
+        for couple, count in meet_count.items()
+        if count > 0
+    }
+
+
+def couple_score(goals: JointCouple, report: Report) -> float:
+    """Score of couple like Scheduler, spread plus average holiday spread plus weighted share of each couple met, see meet_percent."""
+    hol_spread = sum(
+        report.spread_score(goals.fam_prime_dist, holiday) for holiday in Holidays
+    ) / len(Holidays)
+    match = sum(
+        goals.sib_weights.get(couple, 0.0) * percent / 100
+        for couple, percent in meet_percent(report).items()
+    )
+    return report.spread_score(goals.fam_prime_dist) + hol_spread + match
+
+
+def joint_scores(
+    problem: JointProblem, schedules: Dict[Couples, CoupleSchedule]
+) -> Dict[Couples, float]:
+    """Score of every couple for schedules, total score is their sum."""
+    places = PlaceTable.from_places(joint_places(problem, schedules))
+    return {
+        goals.couple: couple_score(goals, Report(places, goals.couple))
+        for goals in problem.couples
+    }
+
+
+def improve_couple(
+    problem: JointProblem, couple: Couples, schedules: Dict[Couples, CoupleSchedule]
+) -> CoupleSchedule:
+    """Schedule of couple from Scheduler with the others fixed to their schedules as rotations.
+
+    Couple keeps holidays GONE in its current schedule, a couple with no schedule yet is scheduled against those that have one.
+    """
+    goals = problem.goals(couple)
+    current = schedules.get(couple)
+    scheduler = _JointScheduler(
+        couple=couple,
+        start_year=problem.start_year,
+        num_years=problem.num_years,
+        fam_prime_dist=goals.fam_prime_dist,
+        sib_weights={
+            other.couple: goals.sib_weights.get(other.couple, 0.0)
+            for other in problem.couples
+        },
+        rotations={
+            other: schedule_rotation(schedule, problem.start_year)
+            for other, schedule in schedules.items()
+            if other != couple
+        },
+        history=problem.history.copy(),
+        families=goals.families or list(goals.fam_prime_dist),
+        gone=(
+            set()
+            if current is None
+            else {
+                (year, holiday)
+                for year, families in zip(problem.years, current)
+                for holiday, family in zip(Holidays, families)
+                if family is Families.GONE
+            }
+        ),
+    )
+    scheduler.schedule()
+    new = [[Families.GONE] * len(Holidays) for _ in problem.years]
+    for place in scheduler.scheduled_places():
+        new[place.year - problem.start_year][
+            HOLIDAY_CODES[place.holiday]
+        ] = place.family
+    return new
+
+
+def independent_groups(problem: JointProblem) -> List[List[Couples]]:
+    """Split couples into groups with no weight between any two of the group, by greedy coloring.
+
+    Couples of a group do not affect each others score so they can be improved at the same time.
+    """
+    groups: List[List[Couples]] = []
+    for goals in problem.couples:
+        for group in groups:
+            if all(
+                goals.sib_weights.get(other, 0.0) == 0
+                and problem.goals(other).sib_weights.get(goals.couple, 0.0) == 0
+                for other in group
+            ):
+                group.append(goals.couple)
+                break
+        else:
+            groups.append([goals.couple])
+    return groups
+
+
+def _improve_args(
+    problem: JointProblem, args: Tuple[Couples, Dict[Couples, CoupleSchedule]]
+) -> CoupleSchedule:
+    """Improve couple against schedules, as one pool item."""
+    return improve_couple(problem, *args)
+
+
+def _improve_group(
+    problem: JointProblem,
+    group: List[Couples],
+    schedules: Dict[Couples, CoupleSchedule],
+    pool: Optional[SharedPool],
+) -> List[CoupleSchedule]:
+    """New schedule of each couple of group against the same schedules, over the pool if there is one and more than one couple."""
+    if pool is None or len(group) == 1:
+        return [improve_couple(problem, couple, schedules) for couple in group]
+    return list(pool.map([(couple, schedules) for couple in group]))
+
+
+def _descend(
+    problem: JointProblem, max_rounds: int, pool: Optional[SharedPool]
+) -> JointResult:
+    """Coordinate descent, see solve."""
+    schedules: Dict[Couples, CoupleSchedule] = {
+        goals.couple: expand_rotation(
+            goals.rotation, problem.start_year, problem.num_years
+        )
+        for goals in problem.couples
+        if goals.rotation is not None
+    }
+    for goals in problem.couples:
+        if goals.couple not in schedules:
+            schedules[goals.couple] = improve_couple(problem, goals.couple, schedules)
+    schedules = {goals.couple: schedules[goals.couple] for goals in problem.couples}
+    scores = joint_scores(problem, schedules)
+    round_scores = [sum(scores.values())]
+    groups = independent_groups(problem)
+    for _ in range(max_rounds):
+        improved = False
+        for group in groups:
+            proposals = _improve_group(problem, group, schedules, pool)
+            accepted = {}
+            for couple, proposal in zip(group, proposals):
+                if proposal == schedules[couple]:
+                    continue
+                new_scores = joint_scores(problem, {**schedules, couple: proposal})
+                if sum(new_scores.values()) > sum(scores.values()):
+                    accepted[couple] = proposal
+            if len(accepted) > 0:
+                schedules = {**schedules, **accepted}
+                scores = joint_scores(problem, schedules)
+                improved = True
+        round_scores.append(sum(scores.values()))
+        if not improved:
+            break
+    return JointResult(schedules=schedules, scores=scores, round_scores=round_scores)
+
+
+def solve(
+    problem: JointProblem, max_rounds: int = 10, max_workers: Optional[int] = 1
+) -> JointResult:
+    """Schedule every couple together by coordinate descent over couples.
+
+    Couples without a rotation are first scheduled greedily against the others.
+    Each round every couple is rescheduled by Scheduler with the others fixed, and kept only if the total score of all couples goes up.
+    Couples with no weight between them are rescheduled together, over a process pool if max_workers is more than 1.
+    Stops after a round with no change kept or after max_rounds.
+
+    Args:
+        problem (JointProblem): Couples and history.
+        max_rounds (int): Most rounds of descent.
+        max_workers (Optional[int]): Processes for independent couples, None for number of cpus, 1 runs in this process.
+
+    Returns:
+        JointResult: Schedule and score of every couple.
+    """
+    if num_workers(max_workers) == 1:
+        return _descend(problem, max_rounds, None)
+    with SharedPool(_improve_args, (problem,), max_workers) as pool:
+        return _descend(problem, max_rounds, pool)
@@ -0,0 +1,116 @@
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from functools import wraps
+from typing import Callable, Dict, Iterator, Optional, TypeVar
+
+Func = TypeVar("Func", bound=Callable)
+
+
+@dataclass
+class PhaseStats:
+    """Number of calls and total wall seconds of a phase."""
+
+    calls: int = 0
+    seconds: float = 0.0
+
+
+class Instrument:
+    """Counts calls and wall time of each phase of a Scheduler run, in total and per scheduled year.
+
+    Pass to Scheduler as instrument to turn on, phases are then wrapped at construction so a Scheduler without one runs untouched.
+    Phases nest, e.g. allocate includes the spread and sib_match calls made while allocating.
+
+    Attributes
+    ----------
+    phases: Dict[str, PhaseStats]
+        Stats of each phase over the whole run.
+    years: Dict[int, Dict[str, PhaseStats]]
+        Stats of each phase of calls made while scheduling each year.
+    """
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, PhaseStats] = {}
+        self.years: Dict[int, Dict[str, PhaseStats]] = {}
+        self._year: Optional[int] = None
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Count one call of phase taking seconds, also to current year if in one."""
+        stats = self.phases.setdefault(phase, PhaseStats())
+        stats.calls += 1
+        stats.seconds += seconds
+        if self._year is not None:
+            year_stats = self.years[self._year].setdefault(phase, PhaseStats())
+            year_stats.calls += 1
+            year_stats.seconds += seconds
+
+    def wrap(self, phase: str, func: Func) -> Func:
+        """Wrap function so each call is timed as phase."""
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add(phase, time.perf_counter() - start)
+
+        return timed
+
+    @contextmanager
+    def time(self, phase: str) -> Iterator[None]:
+        """Time body of with block as one call of phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter() - start)
+
+    @contextmanager
+    def year(self, year: int) -> Iterator[None]:
+        """Attribute phases in body of with block to year, whole block is timed as phase year."""
+        self.years.setdefault(year, {})
+        self._year = year
+        try:
+            with self.time("year"):
+                yield
+        finally:
+            self._year = None
+
+    def to_dict(self) -> Dict:
+        """Stats as plain dict of phases and years, years keyed by string for json."""
+        return {
+            "phases": {phase: asdict(stats) for phase, stats in self.phases.items()},
+            "years": {
+                str(year): {phase: asdict(stats) for phase, stats in phases.items()}
+                for year, phases in self.years.items()
+            },
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """Stats as json text."""
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_prometheus(self, prefix: str = "holidays_scheduler") -> str:
+        """Stats in Prometheus text exposition format, counters of calls and seconds labelled by phase and by phase and year."""
+        lines = []
+        for name, help_text, value in (
+            ("phase_calls_total", "Calls of scheduler phase.", "calls"),
+            ("phase_seconds_total", "Wall seconds in scheduler phase.", "seconds"),
+        ):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for phase, stats in self.phases.items():
+                lines.append(
+                    f'{prefix}_{name}{{phase="{phase}"}} {getattr(stats, value)}'
+                )
+            year_name = name.replace("phase_", "year_phase_")
+            lines.append(f"# HELP {prefix}_{year_name} {help_text[:-1]} per year.")
+            lines.append(f"# TYPE {prefix}_{year_name} counter")
+            for year, phases in self.years.items():
+                for phase, stats in phases.items():
+                    lines.append(
+                        f'{prefix}_{year_name}{{phase="{phase}",year="{year}"}} {getattr(stats, value)}'
+                    )
+        return "\n".join(lines) + "\n"
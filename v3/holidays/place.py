@@ -20,6 +20,14 @@ class PrimeSec:
         """Add to secondary visit count."""
         self.secondary += 1
 
+    def remove_prime(self) -> None:
+        """Remove a primary visit count."""
+        self.primary -= 1
+
+    def remove_sec(self) -> None:
+        """Remove a secondary visit count."""
+        self.secondary -= 1
+
 
 @dataclass
 class Place:
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterator, Optional, Sequence, Tuple
+
+# Function and its leading arguments in the worker process, set once by the pool initializer so they are not pickled per item.
+_FUNC: Optional[Callable[..., Any]] = None
+_SHARED: Tuple[Any, ...] = ()
+
+
+def _init_worker(func: Callable[..., Any], shared: Tuple[Any, ...]) -> None:
+    """Keep function and shared arguments in worker for all its items."""
+    global _FUNC, _SHARED
+    _FUNC = func
+    _SHARED = shared
+
+
+def _run_worker(item: Any) -> Any:
+    """Call function of this worker with shared arguments and item."""
+    assert _FUNC is not None, "Worker not initialized with function"
+    return _FUNC(*_SHARED, item)
+
+
+def num_workers(max_workers: Optional[int] = None) -> int:
+    """Workers to use, None for number of cpus."""
+    return max_workers or os.cpu_count() or 1
+
+
+class SharedPool:
+    """Process pool running func(*shared, item) for items, shared arguments e.g. a problem are sent once per worker.
+
+    Use as context manager, e.g. with SharedPool(run_config, (problem,)) as pool: results = list(pool.map(configs))
+    Items are sent in chunks so every worker stays busy with little overhead.
+    """
+
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        shared: Tuple[Any, ...] = (),
+        max_workers: Optional[int] = None,
+    ) -> None:
+        self.max_workers = num_workers(max_workers)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(func, shared),
+        )
+
+    def map(self, items: Sequence[Any]) -> Iterator[Any]:
+        """Results of every item in same order as items."""
+        chunksize = max(1, len(items) // (self.max_workers * 4))
+        return self._executor.map(_run_worker, items, chunksize=chunksize)
+
+    def __enter__(self) -> SharedPool:
+        """Open pool for with block."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Shut workers down at end of with block."""
+        self._executor.shutdown()
+
+
+def run_pool(
+    func: Callable[..., Any],
+    items: Sequence[Any],
+    shared: Tuple[Any, ...] = (),
+    max_workers: Optional[int] = None,
+) -> Iterator[Any]:
+    """Run func(*shared, item) for every item over a SharedPool, results yielded in same order as items."""
+    with SharedPool(func, shared, max_workers) as pool:
+        yield from pool.map(items)
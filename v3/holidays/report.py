@@ -0,0 +1,129 @@
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple
+
+from holidays.constants import Couples, Families, Holidays, Status
+from holidays.place import Place, PrimeSec
+
+
+class Report:
+    """Results of schedule with metrics, all built from one grouping of places by year, holiday and couple.
+
+    Attributes
+    ----------
+    main_couple: Couples
+        Couple the schedule was made for, matches are counted against them.
+    groups: Dict[Tuple[int, Holidays], Dict[Couples, List[Families]]]
+        Families each couple is at for year and holiday, couples in order first seen.
+    match_count: Dict[Couples, int]
+        Mapping of other couples to number of matches where other couple's place is same as main couple.
+    available: Dict[Couples, int]
+        Number of places each couple is not GONE and available to be matched with.
+    spread: Dict[Optional[Holidays], Dict[Families, PrimeSec]]
+        Visit counts of main couple per family, keyed by holiday and None for all holidays, GONE is not a visit.
+    """
+
+    def __init__(self, places: Iterable[Place], main_couple: Couples) -> None:
+        self.main_couple = main_couple
+        self.groups: Dict[Tuple[int, Holidays], Dict[Couples, List[Families]]] = {}
+        self.available: Dict[Couples, int] = {}
+        self.spread: Dict[Optional[Holidays], Dict[Families, PrimeSec]] = {
+            holiday: {} for holiday in [None, *Holidays]
+        }
+        for place in places:
+            couple_families = self.groups.setdefault((place.year, place.holiday), {})
+            couple_families.setdefault(place.couple, []).append(place.family)
+            if place.family != Families.GONE:
+                self.available[place.couple] = self.available.get(place.couple, 0) + 1
+            if place.couple != main_couple or place.family == Families.GONE:
+                continue
+            for holiday in (None, place.holiday):
+                fam_count = self.spread[holiday].setdefault(place.family, PrimeSec())
+                if place.status == Status.PRIMARY:
+                    fam_count.add_prime()
+                else:
+                    fam_count.add_sec()
+        self.match_count = self._match_count()
+
+    def _match_count(self) -> Dict[Couples, int]:
+        """Per year and holiday, each other couple place matches every main couple place at the same family."""
+        match_count: Dict[Couples, int] = {}
+        for couple_families in self.groups.values():
+            main_families = Counter(couple_families.get(self.main_couple, []))
+            if len(main_families) == 0:
+                continue
+            for couple, families in couple_families.items():
+                if couple == self.main_couple:
+                    continue
+                for family in families:
+                    if main_families[family] == 0:
+                        continue
+                    match_count[couple] = (
+                        match_count.get(couple, 0) + main_families[family]
+                    )
+        return match_count
+
+    @property
+    def match_percent(self) -> Dict[Couples, float]:
+        """Percent of times each other couple is available that main couple matches them."""
+        return {
+            couple: count / self.available[couple] * 100
+            for couple, count in self.match_count.items()
+        }
+
+    def spread_share(self, holiday: Optional[Holidays] = None) -> Dict[Families, float]:
+        """Share of main couple primary visits to each family, for holiday or all holidays if None."""
+        fam_count = self.spread[holiday]
+        num_places = sum(fcount.primary for fcount in fam_count.values())
+        return {
+            family: fcount.primary / num_places if num_places else 0.0
+            for family, fcount in fam_count.items()
+        }
+
+    def spread_score(
+        self, fam_prime_dist: Dict[Families, float], holiday: Optional[Holidays] = None
+    ) -> float:
+        """Score of main couple spread against target distribution, same as scheduler: sum of 1 - abs(actual - target)/target per family."""
+        return sum(
+            1 - abs(fam_prime_dist[family] - share) / fam_prime_dist[family]
+            for family, share in self.spread_share(holiday).items()
+        )
+
+    def rows(self) -> Iterable[str]:
+        """Rendered lines of results table, schedule per year and holiday then matches then spread."""
+        yield "RESULTS\n\n"
+        years = [year for year, _ in self.groups]
+        for year in range(min(years), max(years) + 1):
+            for holiday in Holidays:
+                couple_families = self.groups.get((year, holiday), {})
+                if self.main_couple not in couple_families:
+                    raise ValueError(
+                        f"No place for {self.main_couple.value} at {holiday.value} in {year}"
+                    )
+                our_family = couple_families[self.main_couple][0]
+                other_fam_str = "|".join(
+                    f"{couple.value:^8}|{family.value:^10}"
+                    for couple, families in couple_families.items()
+                    if couple != self.main_couple
+                    for family in families
+                )
+                yield f"|{year:^3}|{holiday.value:^15}|{self.main_couple.value:^2}|{our_family.value:^10}|{other_fam_str}|\n"
+        yield "\n"
+
+        for couple, percent in self.match_percent.items():
+            yield f"| {couple.value:^8} | Availble | {self.available[couple]} | Match | {self.match_count[couple]} | Percent | {percent:.2f}% |\n"
+        yield "\n"
+
+        for holiday in [*Holidays, None]:
+            fam_count = self.spread[holiday]
+            hol_str = "".join(
+                f"{family.value:^7}|{fam_count.get(family, PrimeSec()).primary:^3}|"
+                for family in Families
+                if family is not Families.GONE
+            )
+            name = "All" if holiday is None else holiday.value
+            yield f"|{name:^15}|{hol_str}\n"
+
+    def write(self, out: TextIO) -> None:
+        """Stream rendered lines of results table to file handle."""
+        for row in self.rows():
+            out.write(row)
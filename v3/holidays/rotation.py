@@ -1,7 +1,10 @@
+from array import array
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Iterable, Iterator, List, Tuple
 
-from holidays.constants import Families, Holidays
+from holidays.constants import Couples, Families, Holidays, Status
+from holidays.place import Place
+from holidays.table import FAMILIES, FAMILY_CODES, HOLIDAY_CODES, HOLIDAYS
 
 
 @dataclass
@@ -31,3 +34,63 @@ class Rotation:
             Holidays.EVE: self.eve,
             Holidays.CHRISTMAS: self.christmas,
         }
+
+
+class RotationTable:
+    """Rotations of other couples compiled once into integer table of family codes with shape (couple, cycle_len, holiday).
+
+    Couples with shorter rotations are padded to longest cycle, family for a year is read with modular indexing by couple's own cycle length,
+    so places for any year range are made on demand instead of rebuilding rotation dicts or storing places.
+
+    e.g. Ali rotation of 3 years, family for easter 2025 is table[ali, 2025 % 3, easter].
+    """
+
+    def __init__(self, rotations: Dict[Couples, List[Rotation]]) -> None:
+        self.couples: List[Couples] = list(rotations)
+        self.cycle_lens: List[int] = [len(rotation) for rotation in rotations.values()]
+        self.max_len = max(self.cycle_lens, default=0)
+        self.table = array("B", bytes(len(self.couples) * self.max_len * len(HOLIDAYS)))
+        for couple_idx, rotation in enumerate(rotations.values()):
+            for cycle_idx, year_rotation in enumerate(rotation):
+                for holiday, family in year_rotation.dict().items():
+                    self.table[self._offset(couple_idx, cycle_idx, holiday)] = (
+                        FAMILY_CODES[family]
+                    )
+
+    def _offset(self, couple_idx: int, cycle_idx: int, holiday: Holidays) -> int:
+        """Position in flat table of couple, year in rotation and holiday."""
+        return (couple_idx * self.max_len + cycle_idx) * len(HOLIDAYS) + HOLIDAY_CODES[
+            holiday
+        ]
+
+    def families_at(
+        self, year: int, holiday: Holidays
+    ) -> List[Tuple[Couples, Families]]:
+        """Family each couple is at for the year and holiday."""
+        return [
+            (
+                couple,
+                FAMILIES[
+                    self.table[self._offset(couple_idx, year % cycle_len, holiday)]
+                ],
+            )
+            for couple_idx, (couple, cycle_len) in enumerate(
+                zip(self.couples, self.cycle_lens)
+            )
+        ]
+
+    def places(
+        self, years: Iterable[int], holidays: Iterable[Holidays] = Holidays
+    ) -> Iterator[Place]:
+        """Generate place of each couple for every year and holiday, years outer then holidays then couples."""
+        holidays = list(holidays)
+        for year in years:
+            for holiday in holidays:
+                for couple, family in self.families_at(year, holiday):
+                    yield Place(
+                        year=year,
+                        couple=couple,
+                        holiday=holiday,
+                        family=family,
+                        status=Status.PRIMARY,
+                    )
@@ -1,10 +1,20 @@
+from __future__ import annotations
+
+import hashlib
+import json
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
 
 from holidays.constants import Couples, Families, Holidays, Status
-from holidays.funcs import couple_holiday_count, sibling_match_count
-from holidays.place import Place
-from holidays.rotation import Rotation
+from holidays.funcs import import_places
+from holidays.index import PlaceIndex
+from holidays.metrics import Instrument
+from holidays.place import Place, PrimeSec
+from holidays.rotation import Rotation, RotationTable
+from holidays.store import PlaceStore, append_store, write_store
+from holidays.table import PlaceTable
 
 
 @dataclass
@@ -24,6 +34,14 @@ class Scheduler:
         Importance of matching with each sibling. Weights add to 1. e.g. Ali 50 Lauren 33 James 16
     rotations: Dict[Couples, List[Rotation]]:
         Schedule of each couple where Rotation is 1 year of holidays and list is regular rotation. Just need minimum num rotations until cycle.
+    history: Optional[Iterable[Place]]:
+        Places already visited by couple and others, table is adopted as is so it grows with the schedule.
+    rotation_table: Optional[RotationTable]:
+        Rotations already compiled, e.g. shared between many runs, else compiled from rotations.
+    instrument: Optional[Instrument]:
+        Collects calls and time of each phase per year when given, None runs without any timing.
+    families: Optional[List[Families]]:
+        Families couple can be at, each must be in fam_prime_dist. Defaults to every family but GONE.
     """
 
     couple: Couples
@@ -32,36 +50,118 @@ class Scheduler:
     fam_prime_dist: Dict[Families, float]
     sib_weights: Dict[Couples, float]
     rotations: Dict[Couples, List[Rotation]]
-    history: Optional[List[Place]] = None
+    history: Optional[Iterable[Place]] = None
+    rotation_table: Optional[RotationTable] = None
+    instrument: Optional[Instrument] = None
+    families: Optional[List[Families]] = None
 
     def __post_init__(self) -> None:
-        """Declare list of places to construct schedule.
+        """Declare list of places to construct schedule and running counts used to score candidates.
 
         Attributes
         ----------
-        places: List[Place]
-            List of places ventured by couple for year holiday which family at.
-        other_places: List[Place]
-            List of places gone to by other couples scheduling with.
+        places: PlaceTable
+            Table of places ventured by couple for year holiday which family at.
+        fam_counts: Dict[Optional[Holidays], Dict[Families, PrimeSec]]
+            Running visit counts of the couple per family, keyed by holiday and None for all holidays.
+        index: PlaceIndex
+            Running count of every couple's places per year holiday and family, used for sibling matches.
+        rotation_table: RotationTable
+            Rotations of other couples compiled once, their places are generated from it instead of stored.
+        """
+        self.places = PlaceTable.from_places(
+            self.history if self.history is not None else []
+        )
+        self._fam_counts: Dict[Optional[Holidays], Dict[Families, PrimeSec]] = {
+            holiday: {} for holiday in [None, *Holidays]
+        }
+        self.index = PlaceIndex()
+        if self.families is None:
+            self.families = [
+                family for family in Families if family is not Families.GONE
+            ]
+        if self.rotation_table is None:
+            self.rotation_table = RotationTable(self.rotations)
+        self._rotation_families = self.rotation_table.families_at
+        self._num_history = len(self.places)
+        # Whether history is already in the place store of a checkpoint, see save_checkpoint
+        self._history_stored = False
+        if self.instrument is None:
+            self._record_history()
+        else:
+            self._instrument_phases(self.instrument)
+            with self.instrument.time("history"):
+                self._record_history()
+
+    def _record_history(self) -> None:
+        """Add history places to running counts."""
+        for place in self.places:
+            self._record(place)
+
+    def _instrument_phases(self, instrument: Instrument) -> None:
+        """Replace phase methods of this scheduler with timed wrappers, leaving the class and a shared rotation table untouched.
+
+        Phases are rotation for sibling families lookup, spread and sib_match scoring, allocate for choosing a place and record for adding it.
         """
-        self.places: List[Place] = self.history if self.history is not None else []
+        self._rotation_families = instrument.wrap("rotation", self._rotation_families)
+        self._calc_fam_spread = instrument.wrap("spread", self._calc_fam_spread)
+        self._calc_sib_match = instrument.wrap("sib_match", self._calc_sib_match)
+        self._attempt_allocation = instrument.wrap("allocate", self._attempt_allocation)
+        self._add_place = instrument.wrap("record", self._add_place)
+
+    def _record(self, place: Place) -> None:
+        """Update running counts with a place so scoring never has to rescan all places.
+
+        Every place is added to the index, couple's place also adds visit to the all holiday and given holiday family counts unless GONE.
+        """
+        self.index.add(place)
+        if place.couple != self.couple or place.family is Families.GONE:
+            return
+        for holiday in (None, place.holiday):
+            fam_count = self._fam_counts[holiday].setdefault(place.family, PrimeSec())
+            if place.status == Status.PRIMARY:
+                fam_count.add_prime()
+            else:
+                fam_count.add_sec()
+
+    def _unrecord(self, place: Place) -> None:
+        """Remove a place from running counts, counts reaching zero are dropped so state is as if place was never recorded."""
+        self.index.remove(place)
+        if place.couple != self.couple or place.family is Families.GONE:
+            return
+        for holiday in (None, place.holiday):
+            fam_count = self._fam_counts[holiday][place.family]
+            if place.status == Status.PRIMARY:
+                fam_count.remove_prime()
+            else:
+                fam_count.remove_sec()
+            if fam_count.primary == 0 and fam_count.secondary == 0:
+                del self._fam_counts[holiday][place.family]
+
+    def _add_place(self, place: Place) -> None:
+        """Add place to schedule and running counts."""
+        self.places.append(place)
+        self._record(place)
 
     def _calc_fam_spread(
-        self, places: List[Place], holiday: Optional[Holidays] = None
+        self, place: Place, holiday: Optional[Holidays] = None
     ) -> float:
-        """Get real time distribution of family per couple then score compared to objective.
+        """Get real time distribution of family per couple with attempted place then score compared to objective.
 
         First get count of number of times couple visits each family, then normalizes distribution by dividing count by total occurances.
+        Counts are the running counts plus the attempted place if it counts toward the holiday.
         Then score is average(1 - abs(actual_share - target_share)/target_score) for each family where 0 is worst and 1 is best.
 
         e.g. actual share [3,5,2] notmalized [0.3,0.5,0.2] target dist [0.25,0.5,0.2],
         score = avg[1-2*abs(0.3-0.25)/0.25, 1-2*abs(0.5-0.5)/0.5, 1-2*abs(0.2-0.25)/0.25]=avg[1-0.2 1-0 1-0.2]=avg[0.8,1,0.8]=0.82
         """
-        fam_count = couple_holiday_count(places, self.couple, holiday=holiday)
-        num_places = sum(fcount.primary for fcount in fam_count.values())
-        fam_act_dist = {
-            fam: fcount.primary / num_places for fam, fcount in fam_count.items()
+        fam_count = {
+            fam: fcount.primary for fam, fcount in self._fam_counts[holiday].items()
         }
+        if holiday is None or holiday == place.holiday:
+            fam_count[place.family] = fam_count.get(place.family, 0) + 1
+        num_places = sum(fam_count.values())
+        fam_act_dist = {fam: count / num_places for fam, count in fam_count.items()}
         if len(fam_act_dist) == 0:
             return 1
         return sum(
@@ -69,61 +169,54 @@ class Scheduler:
             for fam, fam_actual in fam_act_dist.items()
         )
 
-    def _calc_sib_match(
-        self, places: List[Place], year: int, holiday: Holidays
-    ) -> float:
+    def _calc_sib_match(self, place: Place) -> float:
         """Get score of sibling matches with the more out of total being best.
 
-        First get number of matches between places of ocuple and other places of other couples with map of other couple to num matches.
+        First get number of matches between places of couple and places of other couples for the attempted place's year and holiday,
+        with map of other couple to num matches, from index lookups of each family at the year and holiday and the other couples' rotations.
         Multiple match by weight of sibling match and divide by number of couples to match to normalize.
 
         e.g places is 4 for year of couple, 2 match for Lauren 1 for Ali, weights 0.5 Ali 0.4 Lauren for both score is sum(1*0.5 + 2*0.4)/4 = 0.325
         """
-        places = [
-            place for place in places if place.year == year and place.holiday == holiday
-        ]
-        sib_matches = sibling_match_count(places, couple=self.couple)
+        sib_matches: Dict[Couples, int] = {}
+        rotation_families = self._rotation_families(place.year, place.holiday)
+        for family in Families:
+            couple_count = self.index.couples_at(place.year, place.holiday, family)
+            count = couple_count.get(self.couple, 0) + (family == place.family)
+            if count == 0:
+                continue
+            for sib, sib_count in couple_count.items():
+                if sib == self.couple:
+                    continue
+                sib_matches[sib] = sib_matches.get(sib, 0) + sib_count * count
+            for sib, sib_family in rotation_families:
+                if sib_family == family:
+                    sib_matches[sib] = sib_matches.get(sib, 0) + count
         return sum(
             sib_match * self.sib_weights[sib] for sib, sib_match in sib_matches.items()
         ) * sum(self.sib_weights.values())
 
-    def _add_other_couples(self, year: int, holiday: Holidays) -> List[Place]:
-        """Based on the other couples and given rotation of holidays for the year, add the place a couple is at the given year and holiday.
+    def _add_other_couples(self, year: int, holiday: Holidays) -> Iterator[Place]:
+        """Based on the other couples and given rotation of holidays for the year, make the place a couple is at the given year and holiday.
 
-        Get the family the holiday is on by first getting rotation based on years rotating through it with modulo,
-        then get family by indexing dict version of rotation object by given holiday.
-        Then form place with family couple year holiday and add a new place object for each couple in rotations object.
+        Family is read from compiled rotation table by rotation year with modulo, places are generated on demand and not stored.
 
         e.g. Lets say Ali schedule alternates every 2 years and on year 3, rotation index = 3 % 2 = 1 so rotation[1],
-        family for easter is rotation[1].easter or rotation[1].dict[Holidays.EASTER] = Palombo, in dict form so no attr needed in loop.
-        Then make place with Palombo fam Ali couple year 3 holiday easter.
+        family for easter is table[ali, 1, easter] = Palombo, then make place with Palombo fam Ali couple year 3 holiday easter.
 
         Args:
             year (int): Year to make place.
             holiday (Holidays): Holiday to make place.
 
         Returns:
-            List[Place]: Other places that couples go to based on location.
+            Iterator[Place]: Other places that couples go to based on location.
         """
-        other_places = []
-        for couple, rotation in self.rotations.items():
-            this_rotation = year % len(rotation)
-            family = rotation[this_rotation].dict()[holiday]
-            other_places.append(
-                Place(
-                    year=year,
-                    couple=couple,
-                    holiday=holiday,
-                    family=family,
-                    status=Status.PRIMARY,
-                )
-            )
-        return other_places
+        return self.rotation_table.places([year], [holiday])
 
     def _attempt_allocation(self, year: int, holiday: Holidays) -> Place:
         """For each family, try it to see which best helps couple get closer to overall distribution and matches other couples.
 
-        Get other couple's current place given the year and holiday based on their schedules.
+        Other couple's current place given the year and holiday is read from their compiled rotations when scoring matches.
         Then try every family option for given year and holiday.
         Based on main couple current visits, determine distribution score if visit given family, higher score is dist closer to ideal.
         Match score then if choosing family will match sibling given their places and current attempted place.
@@ -139,11 +232,7 @@ class Scheduler:
         """
         max_score = -1e10
         max_place: Place
-        other_places = self._add_other_couples(year, holiday)
-        self.places += other_places
-        for family in Families:
-            if family is Families.GONE:
-                continue
+        for family in self.families:
             place = Place(
                 year=year,
                 couple=self.couple,
@@ -151,22 +240,201 @@ class Scheduler:
                 family=family,
                 status=Status.PRIMARY,
             )
-            tmp_places = self.places + [place]
-
-            dist_score = self._calc_fam_spread(tmp_places)
+            dist_score = self._calc_fam_spread(place)
             hol_dist_score = sum(
-                self._calc_fam_spread(tmp_places, sel_holiday)
-                for sel_holiday in Holidays
+                self._calc_fam_spread(place, sel_holiday) for sel_holiday in Holidays
             ) / len(Holidays)
-            match_score = self._calc_sib_match(tmp_places, year=year, holiday=holiday)
+            match_score = self._calc_sib_match(place)
             score = dist_score + match_score + hol_dist_score
             if score > max_score:
                 max_place = place
                 max_score = score
         return max_place
 
+    def scheduled_places(self) -> PlaceTable:
+        """Table of couple's places made by schedule, without history."""
+        return self.places[self._num_history :]
+
+    def sibling_places(self) -> Iterator[Place]:
+        """Generate places of other couples for every scheduled year and holiday from their rotations."""
+        return self.rotation_table.places(
+            range(self.start_year, self.num_years + self.start_year)
+        )
+
+    def all_places(self) -> Iterator[Place]:
+        """Generate history then for each scheduled year and holiday the other couples' places followed by the couple's place."""
+        places = iter(self.places)
+        yield from islice(places, self._num_history)
+        for place in places:
+            yield from self._add_other_couples(place.year, place.holiday)
+            yield place
+
+    def _schedule_year(self, year: int) -> None:
+        """Allocate every holiday of year."""
+        for holiday in Holidays:
+            self._add_place(self._attempt_allocation(year, holiday))
+
     def schedule(self):
         """Main method to do scheduling for every yer and holiday."""
         for year in range(self.start_year, self.num_years + self.start_year):
-            for holiday in Holidays:
-                self.places.append(self._attempt_allocation(year, holiday))
+            if self.instrument is None:
+                self._schedule_year(year)
+            else:
+                with self.instrument.year(year):
+                    self._schedule_year(year)
+
+    def save_checkpoint(self, path: Path, history_path: Path) -> None:
+        """Save running counts, sibling index of scheduled years and scheduled places to json so a later run can resume with from_checkpoint.
+
+        History places are saved once to a binary place store next to the checkpoint, later runs only append to it.
+        Size and digest of the history csv are saved to check the csv only had rows appended when resuming.
+
+        Args:
+            path (Path): Checkpoint json to write.
+            history_path (Path): History csv this scheduler's history was read from.
+        """
+        store_path = checkpoint_store_path(path)
+        if not self._history_stored:
+            write_store(self.places[: self._num_history], store_path)
+            self._history_stored = True
+        history_bytes = Path(history_path).stat().st_size
+        scheduled = self.scheduled_places()
+        checkpoint = {
+            "couple": self.couple.value,
+            "start_year": self.start_year,
+            "num_history": self._num_history,
+            "history_bytes": history_bytes,
+            "history_digest": file_digest(history_path, history_bytes),
+            "fam_counts": [
+                [
+                    None if holiday is None else holiday.value,
+                    family.value,
+                    fam_count.primary,
+                    fam_count.secondary,
+                ]
+                for holiday, fam_counts in self._fam_counts.items()
+                for family, fam_count in fam_counts.items()
+            ],
+            # Index is only read at scheduled years, so earlier years are left out
+            "index": [
+                [
+                    year,
+                    holiday.value,
+                    family.value,
+                    [[couple.value, count] for couple, count in couple_count.items()],
+                ]
+                for (year, holiday, family), couple_count in self.index.items()
+                if year >= self.start_year
+            ],
+            "scheduled": [
+                [
+                    place.year,
+                    place.couple.value,
+                    place.holiday.value,
+                    place.family.value,
+                    place.status.value,
+                ]
+                for place in scheduled
+            ],
+        }
+        Path(path).write_text(json.dumps(checkpoint))
+
+    @classmethod
+    def from_checkpoint(cls, path: Path, history_path: Path, **kwargs) -> Scheduler:
+        """Resume from checkpoint after rows were appended to the history csv, e.g. last season, ready to schedule the future years.
+
+        Counts are loaded instead of recomputed and the places scheduled last run are removed from them,
+        history the checkpoint saw is read from its place store and only csv rows after it are parsed and recorded.
+        If the csv does not start with the exact bytes the checkpoint saw, e.g. a past row was edited, the store does not match the checkpoint
+        or start year is before the checkpoint's, the scheduler is made from the whole csv instead.
+        Either way result of schedule is the same as a Scheduler made from all history.
+
+        Args:
+            path (Path): Checkpoint saved by save_checkpoint.
+            history_path (Path): History csv, the checkpoint's history followed by new rows.
+            kwargs: Other arguments of Scheduler, start_year and num_years are the future years to schedule.
+
+        Returns:
+            Scheduler: Scheduler with all history recorded.
+        """
+        checkpoint = json.loads(Path(path).read_text())
+        if Couples(checkpoint["couple"]) != kwargs["couple"]:
+            raise ValueError(
+                f"Checkpoint {path} is for {checkpoint['couple']} not {kwargs['couple'].value}"
+            )
+        history_bytes = checkpoint["history_bytes"]
+        store_path = checkpoint_store_path(path)
+        if (
+            kwargs["start_year"] < checkpoint["start_year"]
+            or Path(history_path).stat().st_size < history_bytes
+            or file_digest(history_path, history_bytes) != checkpoint["history_digest"]
+            or not ends_line(history_path, history_bytes)
+            or not store_path.exists()
+        ):
+            return cls(history=import_places(history_path), **kwargs)
+        try:
+            with PlaceStore(store_path) as store:
+                if len(store) != checkpoint["num_history"]:
+                    return cls(history=import_places(history_path), **kwargs)
+                table = store.table()
+        except ValueError:
+            # Store is damaged, e.g. truncated by an interrupted append
+            return cls(history=import_places(history_path), **kwargs)
+
+        scheduler = cls(history=None, **kwargs)
+        for holiday, family, primary, secondary in checkpoint["fam_counts"]:
+            scheduler._fam_counts[None if holiday is None else Holidays(holiday)][
+                Families(family)
+            ] = PrimeSec(primary, secondary)
+        for year, holiday, family, couple_count in checkpoint["index"]:
+            scheduler.index.set_counts(
+                year,
+                Holidays(holiday),
+                Families(family),
+                {Couples(couple): count for couple, count in couple_count},
+            )
+        for year, couple, holiday, family, status in checkpoint["scheduled"]:
+            scheduler._unrecord(
+                Place(
+                    year=year,
+                    couple=Couples(couple),
+                    holiday=Holidays(holiday),
+                    family=Families(family),
+                    status=Status(status),
+                )
+            )
+        new_places = import_places(history_path, start=history_bytes)
+        if len(new_places) > 0:
+            append_store(new_places, store_path)
+        scheduler._history_stored = True
+        for place in new_places:
+            table.append(place)
+            scheduler._record(place)
+        scheduler.history = scheduler.places = table
+        scheduler._num_history = len(table)
+        return scheduler
+
+
+def checkpoint_store_path(path: Path) -> Path:
+    """Place store of history saved with checkpoint at path."""
+    return Path(path).with_suffix(".places")
+
+
+def ends_line(path: Path, size: int) -> bool:
+    """Whether the first size bytes of file end with a newline, so bytes after start a new row."""
+    with open(path, "rb") as data_file:
+        data_file.seek(max(size - 1, 0))
+        return data_file.read(1) == b"\n"
+
+
+def file_digest(path: Path, size: int) -> str:
+    """Sha256 hex digest of the first size bytes of file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as data_file:
+        while size > 0:
+            chunk = data_file.read(min(size, 1 << 20))
+            if len(chunk) == 0:
+                break
+            digest.update(chunk)
+            size -= len(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from holidays.place import Place
+from holidays.table import COUPLES, FAMILIES, HOLIDAYS, STATUSES, PlaceTable
+
+# File is header then blocks, each append adds a block so file is never rewritten.
+# Header: magic, version, vocab length then vocab json of enum values in code order, padded to 8 bytes.
+# Block: number of places then year column of uint16 little endian and couple holiday family status columns of uint8, padded to 8 bytes.
+MAGIC = b"HPLC"
+VERSION = 1
+HEADER = struct.Struct("<4sHI")
+BLOCK = struct.Struct("<Q")
+CODE_COLUMNS = ("couple", "holiday", "family", "status")
+
+
+def _vocab() -> Dict[str, List[str]]:
+    """Values of each enum in code order, stored so codes can be read back even if enums change."""
+    return {
+        "couple": [couple.value for couple in COUPLES],
+        "holiday": [holiday.value for holiday in HOLIDAYS],
+        "family": [family.value for family in FAMILIES],
+        "status": [status.value for status in STATUSES],
+    }
+
+
+def _pad(length: int) -> bytes:
+    """Zero bytes to pad length to multiple of 8."""
+    return bytes(-length % 8)
+
+
+def _block(places: Iterable[Place]) -> bytes:
+    """Encode places as one block of columns."""
+    table = PlaceTable.from_places(places)
+    year = array("H", table.year)
+    if sys.byteorder == "big":
+        year.byteswap()
+    data = (
+        BLOCK.pack(len(table))
+        + year.tobytes()
+        + b"".join(getattr(table, name).tobytes() for name in CODE_COLUMNS)
+    )
+    return data + _pad(len(data))
+
+
+def write_store(places: Iterable[Place], path: Path) -> None:
+    """Write places to new binary store, replacing any file at path."""
+    vocab = json.dumps(_vocab()).encode()
+    header = HEADER.pack(MAGIC, VERSION, len(vocab)) + vocab
+    with open(path, "wb") as store_file:
+        store_file.write(header + _pad(len(header)))
+        store_file.write(_block(places))
+
+
+def append_store(places: Iterable[Place], path: Path) -> None:
+    """Append places, e.g. new years, as a new block at end of store without rewriting it.
+
+    Store must have been written with the same enums, as codes are appended as is.
+    """
+    with PlaceStore(path) as store:
+        if store.vocab != _vocab():
+            raise ValueError(f"{path} written with different enums, rewrite it instead")
+    with open(path, "ab") as store_file:
+        store_file.write(_block(places))
+
+
+@dataclass
+class StoreBlock:
+    """Columns of one block as zero copy views into the memory mapped file.
+
+    Views are released when the store is closed, using them after raises ValueError, copy them first to keep them.
+    """
+
+    year: memoryview
+    couple: memoryview
+    holiday: memoryview
+    family: memoryview
+    status: memoryview
+
+    def __len__(self) -> int:
+        """Number of places in block."""
+        return len(self.year)
+
+
+class PlaceStore:
+    """Reader of binary store, file is memory mapped and blocks are read as views without copying.
+
+    Use as context manager so the map is closed, e.g. with PlaceStore(path) as store: history = store.table()
+    Blocks are only valid until the store is closed.
+
+    Attributes
+    ----------
+    vocab: Dict[str, List[str]]
+        Enum values of each code column in code order as written.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._file = open(path, "rb")
+        # Every view made of the map, released on close so the map can be closed
+        self._views: List[memoryview] = []
+        self._map: Optional[mmap.mmap] = None
+        try:
+            self._read_layout()
+        except Exception:
+            self.close()
+            raise
+
+    def _read_layout(self) -> None:
+        """Map file, read vocab and find offset of every block.
+
+        Raises ValueError if file is not a store or a block goes past end of file, e.g. an interrupted append_store.
+        """
+        not_store = f"{self.path} is not a version {VERSION} place store"
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, vocab_len = HEADER.unpack_from(self._map, 0)
+        except (ValueError, struct.error) as err:
+            raise ValueError(not_store) from err
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(not_store)
+        vocab_start = HEADER.size
+        header_len = vocab_start + vocab_len
+        if header_len > len(self._map):
+            raise ValueError(not_store)
+        self.vocab: Dict[str, List[str]] = json.loads(self._map[vocab_start:header_len])
+        self._offsets: List[int] = []
+        offset = header_len + len(_pad(header_len))
+        while offset < len(self._map):
+            if offset + BLOCK.size > len(self._map):
+                raise ValueError(f"{self.path} block at {offset} is truncated")
+            (count,) = BLOCK.unpack_from(self._map, offset)
+            block_len = BLOCK.size + count * (2 + len(CODE_COLUMNS))
+            if offset + block_len > len(self._map):
+                raise ValueError(
+                    f"{self.path} block at {offset} of {count} places is truncated"
+                )
+            self._offsets.append(offset)
+            offset += block_len + len(_pad(block_len))
+
+    def blocks(self) -> Iterator[StoreBlock]:
+        """Columns of each block in order, as views of the map so nothing is copied."""
+        assert self._map is not None, "Store is closed"
+        view = memoryview(self._map)
+        self._views.append(view)
+        for offset in self._offsets:
+            (count,) = BLOCK.unpack_from(self._map, offset)
+            start = offset + BLOCK.size
+            year_bytes = view[start : start + 2 * count]
+            year = year_bytes.cast("H")
+            self._views.extend([year_bytes, year])
+            start += 2 * count
+            codes = []
+            for _ in CODE_COLUMNS:
+                codes.append(view[start : start + count])
+                start += count
+            self._views.extend(codes)
+            yield StoreBlock(year, *codes)
+
+    def table(self) -> PlaceTable:
+        """Table of all places, one bulk copy per column of each block.
+
+        Codes are translated to current enum codes if enums changed since store was written.
+        """
+        current = _vocab()
+        translations = {
+            name: (
+                None
+                if self.vocab[name] == current[name]
+                else bytes(
+                    current[name].index(value) for value in self.vocab[name]
+                ).ljust(256, b"\0")
+            )
+            for name in CODE_COLUMNS
+        }
+        table = PlaceTable()
+        for block in self.blocks():
+            table.year.frombytes(block.year.cast("B"))
+            for name in CODE_COLUMNS:
+                data = getattr(block, name)
+                translation = translations[name]
+                getattr(table, name).frombytes(
+                    data
+                    if translation is None
+                    else data.tobytes().translate(translation)
+                )
+        if sys.byteorder == "big":
+            table.year.byteswap()
+        return table
+
+    def __len__(self) -> int:
+        """Number of places in all blocks."""
+        assert self._map is not None, "Store is closed"
+        return sum(BLOCK.unpack_from(self._map, offset)[0] for offset in self._offsets)
+
+    def close(self) -> None:
+        """Release views of blocks, then close map and file.
+
+        File is closed even if map cannot be, e.g. BufferError when caller still holds views made from a block.
+        """
+        try:
+            # Views made from other views must be released first
+            for view in reversed(self._views):
+                view.release()
+            self._views = []
+            if self._map is not None:
+                self._map.close()
+        finally:
+            self._map = None
+            self._file.close()
+
+    def __enter__(self) -> PlaceStore:
+        """Open store for with block."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Close store at end of with block."""
+        self.close()
+
+
+def read_store(path: Path) -> PlaceTable:
+    """Read all places of binary store into table."""
+    with PlaceStore(path) as store:
+        return store.table()
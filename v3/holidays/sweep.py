@@ -0,0 +1,178 @@
+import csv
+import itertools
+import random
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from holidays.constants import Couples, Families, Holidays
+from holidays.pool import run_pool
+from holidays.report import Report
+from holidays.rotation import Rotation, RotationTable
+from holidays.schedule import Scheduler
+from holidays.table import PlaceTable
+
+
+@dataclass
+class SweepProblem:
+    """Parts of scheduling problem shared by every run of a sweep, sent once to each worker.
+
+    History is parsed and rotations compiled once here, each run schedules on a copy of the history.
+    """
+
+    couple: Couples
+    start_year: int
+    num_years: int
+    rotations: Dict[Couples, List[Rotation]]
+    history: PlaceTable
+
+    def __post_init__(self) -> None:
+        """Compile rotations once for all runs."""
+        self.rotation_table = RotationTable(self.rotations)
+
+
+@dataclass
+class SweepConfig:
+    """Target family distribution and sibling weights of one run."""
+
+    fam_prime_dist: Dict[Families, float]
+    sib_weights: Dict[Couples, float]
+
+
+@dataclass
+class SweepResult:
+    """Metrics of one run, same as printed in results.
+
+    match_percent is percent each sibling is matched when available,
+    spread_score is score of all holiday spread and holiday_spread_score average score of each holiday spread, as in Scheduler.
+    """
+
+    config: SweepConfig
+    match_percent: Dict[Couples, float]
+    spread_score: float
+    holiday_spread_score: float
+    seconds: float
+
+
+def grid_configs(
+    fam_prime_dists: Iterable[Dict[Families, float]],
+    sib_weights: Iterable[Dict[Couples, float]],
+) -> List[SweepConfig]:
+    """Every combination of distribution and weights."""
+    return [
+        SweepConfig(fam_prime_dist=dist, sib_weights=weights)
+        for dist, weights in itertools.product(fam_prime_dists, sib_weights)
+    ]
+
+
+def random_configs(
+    num_samples: int,
+    families: List[Families],
+    couples: List[Couples],
+    seed: Optional[int] = None,
+) -> List[SweepConfig]:
+    """Random distributions normalized to add to 1 and random weights between 0 and 1."""
+    rng = random.Random(seed)
+    configs = []
+    for _ in range(num_samples):
+        shares = [rng.uniform(0.05, 1) for _ in families]
+        configs.append(
+            SweepConfig(
+                fam_prime_dist={
+                    family: share / sum(shares)
+                    for family, share in zip(families, shares)
+                },
+                sib_weights={couple: rng.random() for couple in couples},
+            )
+        )
+    return configs
+
+
+def run_config(problem: SweepProblem, config: SweepConfig) -> SweepResult:
+    """Schedule problem with config then measure results."""
+    start = time.perf_counter()
+    scheduler = Scheduler(
+        couple=problem.couple,
+        start_year=problem.start_year,
+        num_years=problem.num_years,
+        fam_prime_dist=config.fam_prime_dist,
+        sib_weights=config.sib_weights,
+        rotations=problem.rotations,
+        history=problem.history.copy(),
+        rotation_table=problem.rotation_table,
+    )
+    scheduler.schedule()
+    report = Report(scheduler.all_places(), problem.couple)
+    return SweepResult(
+        config=config,
+        match_percent=report.match_percent,
+        spread_score=report.spread_score(config.fam_prime_dist),
+        holiday_spread_score=sum(
+            report.spread_score(config.fam_prime_dist, holiday) for holiday in Holidays
+        )
+        / len(Holidays),
+        seconds=time.perf_counter() - start,
+    )
+
+
+def sweep(
+    problem: SweepProblem,
+    configs: List[SweepConfig],
+    max_workers: Optional[int] = None,
+) -> List[SweepResult]:
+    """Run every config over process pool, results in same order as configs.
+
+    Problem is sent once per worker, runs are sent in chunks so every worker stays busy with little overhead.
+    Raises ValueError before any run if a config misses a family or sibling weight the Scheduler needs.
+    """
+    families = [family for family in Families if family is not Families.GONE]
+    sibs = set(problem.rotations) | {place.couple for place in problem.history}
+    sibs.discard(problem.couple)
+    for idx, config in enumerate(configs):
+        missing_dist = [
+            family for family in families if family not in config.fam_prime_dist
+        ]
+        if len(missing_dist) > 0:
+            raise ValueError(
+                f"Config {idx} missing distribution for {', '.join(fam.value for fam in missing_dist)}"
+            )
+        missing_weight = [
+            couple
+            for couple in Couples
+            if couple in sibs and couple not in config.sib_weights
+        ]
+        if len(missing_weight) > 0:
+            raise ValueError(
+                f"Config {idx} missing weight for {', '.join(couple.value for couple in missing_weight)}"
+            )
+    return list(run_pool(run_config, configs, (problem,), max_workers))
+
+
+def export_results(results: List[SweepResult], csv_path: Path) -> None:
+    """Export one row per run with distribution, weights, match percents and spread scores."""
+    if len(results) == 0:
+        return
+    families = list(results[0].config.fam_prime_dist)
+    couples = list(results[0].config.sib_weights)
+    with open(csv_path, "w", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(
+            ["run"]
+            + [f"dist_{family.value}" for family in families]
+            + [f"weight_{couple.value}" for couple in couples]
+            + [f"match_{couple.value}" for couple in couples]
+            + ["spread_score", "holiday_spread_score", "seconds"]
+        )
+        for run, result in enumerate(results):
+            writer.writerow(
+                [run]
+                + [f"{result.config.fam_prime_dist[family]:.4f}" for family in families]
+                + [f"{result.config.sib_weights[couple]:.4f}" for couple in couples]
+                + [f"{result.match_percent.get(couple, 0.0):.2f}" for couple in couples]
+                + [
+                    f"{result.spread_score:.4f}",
+                    f"{result.holiday_spread_score:.4f}",
+                    f"{result.seconds:.4f}",
+                ]
+            )
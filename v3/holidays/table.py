@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from array import array
+from itertools import compress
+from typing import Dict, Iterable, Iterator, List, Optional, Union, overload
+
+from holidays.constants import Couples, Families, Holidays, Status
+from holidays.place import Place
+
+# Small int codes of enums, code is index of member in enum order.
+COUPLES: List[Couples] = list(Couples)
+HOLIDAYS: List[Holidays] = list(Holidays)
+FAMILIES: List[Families] = list(Families)
+STATUSES: List[Status] = list(Status)
+COUPLE_CODES: Dict[Couples, int] = {couple: code for code, couple in enumerate(COUPLES)}
+HOLIDAY_CODES: Dict[Holidays, int] = {
+    holiday: code for code, holiday in enumerate(HOLIDAYS)
+}
+FAMILY_CODES: Dict[Families, int] = {
+    family: code for code, family in enumerate(FAMILIES)
+}
+STATUS_CODES: Dict[Status, int] = {status: code for code, status in enumerate(STATUSES)}
+
+
+class PlaceTable:
+    """Columnar table of places, each field stored as compact integer array instead of a Place object per event.
+
+    Year is stored as unsigned 16 bit int, couple holiday family and status as unsigned 8 bit enum codes,
+    so each event costs 6 bytes instead of a dataclass instance.
+    Iterating or indexing the table gives back Place objects so it can be used anywhere a list of places was.
+
+    Attributes
+    ----------
+    year: array
+        Year of each place.
+    couple: array
+        Couple code of each place, index into COUPLES.
+    holiday: array
+        Holiday code of each place, index into HOLIDAYS.
+    family: array
+        Family code of each place, index into FAMILIES.
+    status: array
+        Status code of each place, index into STATUSES.
+    """
+
+    def __init__(self) -> None:
+        self.year = array("H")
+        self.couple = array("B")
+        self.holiday = array("B")
+        self.family = array("B")
+        self.status = array("B")
+
+    @classmethod
+    def from_places(cls, places: Iterable[Place]) -> PlaceTable:
+        """Make table from places, if already a table returns it as is."""
+        if isinstance(places, PlaceTable):
+            return places
+        table = cls()
+        table.extend(places)
+        return table
+
+    def append(self, place: Place) -> None:
+        """Add place to end of table."""
+        self.year.append(place.year)
+        self.couple.append(COUPLE_CODES[place.couple])
+        self.holiday.append(HOLIDAY_CODES[place.holiday])
+        self.family.append(FAMILY_CODES[place.family])
+        self.status.append(STATUS_CODES[place.status])
+
+    def extend(self, places: Iterable[Place]) -> None:
+        """Add all places to end of table."""
+        for place in places:
+            self.append(place)
+
+    def copy(self) -> PlaceTable:
+        """New table with copy of every column."""
+        table = PlaceTable()
+        for name in ("year", "couple", "holiday", "family", "status"):
+            column = getattr(self, name)
+            setattr(table, name, array(column.typecode, column))
+        return table
+
+    def mask(
+        self,
+        year: Optional[int] = None,
+        couple: Optional[Couples] = None,
+        holiday: Optional[Holidays] = None,
+        family: Optional[Families] = None,
+        status: Optional[Status] = None,
+    ) -> List[bool]:
+        """Boolean mask of places matching all given fields, fields that are None match everything.
+
+        e.g. mask(couple=Couples.US, holiday=Holidays.EASTER) is True for every easter place of Us.
+        """
+        checks = [
+            (column, code)
+            for column, code in (
+                (self.year, year),
+                (self.couple, None if couple is None else COUPLE_CODES[couple]),
+                (self.holiday, None if holiday is None else HOLIDAY_CODES[holiday]),
+                (self.family, None if family is None else FAMILY_CODES[family]),
+                (self.status, None if status is None else STATUS_CODES[status]),
+            )
+            if code is not None
+        ]
+        if len(checks) == 0:
+            return [True] * len(self)
+        if len(checks) == 1:
+            column, code = checks[0]
+            return list(map(code.__eq__, column))
+        return list(
+            map(all, zip(*(map(code.__eq__, column) for column, code in checks)))
+        )
+
+    def filter(self, mask: Iterable[bool]) -> PlaceTable:
+        """New table of places where mask is True."""
+        mask = list(mask)
+        table = PlaceTable()
+        for name in ("year", "couple", "holiday", "family", "status"):
+            column = getattr(self, name)
+            setattr(table, name, array(column.typecode, compress(column, mask)))
+        return table
+
+    def where(
+        self,
+        year: Optional[int] = None,
+        couple: Optional[Couples] = None,
+        holiday: Optional[Holidays] = None,
+        family: Optional[Families] = None,
+        status: Optional[Status] = None,
+    ) -> PlaceTable:
+        """New table of places matching all given fields, see mask."""
+        return self.filter(self.mask(year, couple, holiday, family, status))
+
+    def to_places(self) -> List[Place]:
+        """Convert table back to list of place objects."""
+        return list(self)
+
+    def __len__(self) -> int:
+        """Number of places in table."""
+        return len(self.year)
+
+    @overload
+    def __getitem__(self, index: int) -> Place: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> PlaceTable: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Place, PlaceTable]:
+        """Place object of given row, or new table of rows if sliced."""
+        if isinstance(index, slice):
+            table = PlaceTable()
+            for name in ("year", "couple", "holiday", "family", "status"):
+                setattr(table, name, getattr(self, name)[index])
+            return table
+        return Place(
+            year=self.year[index],
+            couple=COUPLES[self.couple[index]],
+            holiday=HOLIDAYS[self.holiday[index]],
+            family=FAMILIES[self.family[index]],
+            status=STATUSES[self.status[index]],
+        )
+
+    def __iter__(self) -> Iterator[Place]:
+        """Iterate place objects of each row in order."""
+        for year, couple, holiday, family, status in zip(
+            self.year, self.couple, self.holiday, self.family, self.status
+        ):
+            yield Place(
+                year=year,
+                couple=COUPLES[couple],
+                holiday=HOLIDAYS[holiday],
+                family=FAMILIES[family],
+                status=STATUSES[status],
+            )
@@ -0,0 +1,80 @@
+import argparse
+from pathlib import Path
+from typing import Dict, List
+
+from holidays.constants import Families, Holidays
+from holidays.funcs import export_csv, import_places
+from holidays.joint import JointCouple, JointProblem, joint_places, solve
+from main import (
+    COUPLE,
+    FAM_PRIME_DIST,
+    HOLIDAY_PLACES,
+    NUM_YEARS,
+    ROTATIONS,
+    SIB_WEIGHTS,
+    START_YEAR,
+)
+
+
+def family_dist(families: List[Families]) -> Dict[Families, float]:
+    """Share of each family in list, not counting GONE."""
+    families = [family for family in families if family is not Families.GONE]
+    return {family: families.count(family) / len(families) for family in set(families)}
+
+
+def main() -> None:
+    """Schedule main couple and siblings together.
+
+    Siblings start from their rotations, stay at the families of their rotation aiming for their share of them over history and rotation,
+    and weigh matching main couple as main couple weighs them.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--history", type=Path, default=HOLIDAY_PLACES)
+    parser.add_argument(
+        "--out", type=Path, default=Path(__file__).parent / "data" / "joint.csv"
+    )
+    args = parser.parse_args()
+
+    history = import_places(args.history)
+    couples = [JointCouple(COUPLE, FAM_PRIME_DIST, SIB_WEIGHTS)]
+    for couple, rotation in ROTATIONS.items():
+        rotation_families = [
+            family
+            for year_rotation in rotation
+            for family in year_rotation.dict().values()
+        ]
+        couples.append(
+            JointCouple(
+                couple=couple,
+                fam_prime_dist=family_dist(
+                    rotation_families
+                    + [place.family for place in history.where(couple=couple)]
+                ),
+                sib_weights={COUPLE: SIB_WEIGHTS[couple]},
+                rotation=rotation,
+                families=[
+                    family
+                    for family in Families
+                    if family in rotation_families and family is not Families.GONE
+                ],
+            )
+        )
+    problem = JointProblem(START_YEAR, NUM_YEARS, couples, history)
+    result = solve(problem, max_rounds=args.rounds, max_workers=args.workers)
+
+    export_csv(joint_places(problem, result.schedules), args.out)
+    print(
+        "Total score per round "
+        + " ".join(f"{score:.3f}" for score in result.round_scores)
+    )
+    for couple, score in result.scores.items():
+        print(f"{couple.value:8} score {score:.3f}")
+    print(
+        f"{len(result.schedules) * NUM_YEARS * len(Holidays)} places written to {args.out}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import argparse
+from pathlib import Path
+from typing import List
+
+from holidays.funcs import import_places
+from holidays.sweep import (
+    SweepProblem,
+    export_results,
+    grid_configs,
+    random_configs,
+    sweep,
+)
+from main import (
+    COUPLE,
+    FAM_PRIME_DIST,
+    HOLIDAY_PLACES,
+    NUM_YEARS,
+    ROTATIONS,
+    SIB_WEIGHTS,
+    START_YEAR,
+)
+
+
+def parse_floats(text: str) -> List[float]:
+    """Comma separated floats e.g. 0.44,0.28,0.28"""
+    return [float(val) for val in text.split(",")]
+
+
+def main() -> None:
+    """Sweep family distributions and sibling weights of main problem, either grid of given values or random samples."""
+    families = list(FAM_PRIME_DIST)
+    couples = list(SIB_WEIGHTS)
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument(
+        "--dist",
+        type=parse_floats,
+        action="append",
+        help=f"Family distribution in order {','.join(fam.value for fam in families)}, repeat for grid.",
+    )
+    parser.add_argument(
+        "--weights",
+        type=parse_floats,
+        action="append",
+        help=f"Sibling weights in order {','.join(couple.value for couple in couples)}, repeat for grid.",
+    )
+    parser.add_argument(
+        "--samples", type=int, default=0, help="Number of random configs instead."
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--history", type=Path, default=HOLIDAY_PLACES)
+    parser.add_argument(
+        "--out", type=Path, default=Path(__file__).parent / "data" / "sweep.csv"
+    )
+    args = parser.parse_args()
+
+    problem = SweepProblem(
+        couple=COUPLE,
+        start_year=START_YEAR,
+        num_years=NUM_YEARS,
+        rotations=ROTATIONS,
+        history=import_places(args.history),
+    )
+    if args.samples > 0:
+        configs = random_configs(args.samples, families, couples, seed=args.seed)
+    else:
+        for dist in args.dist or []:
+            if len(dist) != len(families):
+                parser.error(
+                    f"--dist needs {len(families)} values, one per family, got {len(dist)}"
+                )
+        for weight in args.weights or []:
+            if len(weight) != len(couples):
+                parser.error(
+                    f"--weights needs {len(couples)} values, one per sibling, got {len(weight)}"
+                )
+        dists = [dict(zip(families, dist)) for dist in args.dist or []]
+        weights = [dict(zip(couples, weight)) for weight in args.weights or []]
+        configs = grid_configs(dists or [FAM_PRIME_DIST], weights or [SIB_WEIGHTS])
+
+    results = sweep(problem, configs, max_workers=args.workers)
+    export_results(results, args.out)
+    best = max(
+        range(len(results)),
+        key=lambda run: results[run].spread_score + results[run].holiday_spread_score,
+    )
+    print(f"{len(results)} runs written to {args.out}, best spread run {best}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,46 +1,98 @@
+import csv
+import itertools
+from enum import Enum
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, List, Type, TypeVar
 
-import pandas as pd  # type: ignore
 from holidays.constants import Couples, Families, Holidays
 from holidays.place import Place
 
+EnumType = TypeVar("EnumType", bound=Enum)
+
+
+def enum_lookup(enum: Type[EnumType]) -> Dict[str, EnumType]:
+    """Mapping of upper case name and value of each member to member, for case-insensitive lookup of either."""
+    lookup = {member.name.upper(): member for member in enum}
+    lookup.update({str(member.value).upper(): member for member in enum})
+    return lookup
+
 
 def import_places(csv_path: Path) -> List[Place]:
     """Given csv, import to get list of place objects.
 
-    CSV has year header int, couple holiday family headers with strings that match values of corresponding structs case-insensitive.
+    CSV has year header int, couple holiday family headers with strings that match names or values of corresponding structs case-insensitive.
+    Rows are streamed and each string mapped with one lookup, all invalid rows are reported with line number in one ValueError.
     """
-    pd_csv = pd.read_csv(csv_path)
-    return [
-        Place(
-            year=row["year"],
-            couple=Couples.__dict__[row["couple"].upper()],
-            holiday=Holidays.__dict__[row["holiday"].upper()],
-            family=Families.__dict__[row["family"].upper()],
-        )
-        for _, row in pd_csv.iterrows()
-    ]
-
-
-def export_final_csv(
-    our_places: List[Place],
-    ali_places: List[Place],
-    lauren_places: List[Place],
-    csv_path: Path,
-) -> None:
-    pd_dict: Dict[str, List[str]] = {
-        "year": [],
-        "holiday": [],
-        "our_family": [],
-        "ali_family": [],
-        "lauren_family": [],
+    couples = enum_lookup(Couples)
+    holidays = enum_lookup(Holidays)
+    families = enum_lookup(Families)
+    places = []
+    errors = []
+    with open(csv_path, newline="") as csv_file:
+        reader = csv.DictReader(csv_file)
+        missing = [
+            col
+            for col in ("year", "couple", "holiday", "family")
+            if col not in (reader.fieldnames or [])
+        ]
+        if len(missing) > 0:
+            raise ValueError(f"{csv_path} missing columns {', '.join(missing)}")
+        for row in reader:
+            try:
+                places.append(
+                    Place(
+                        year=int(row["year"]),
+                        couple=couples[row["couple"].upper()],
+                        holiday=holidays[row["holiday"].upper()],
+                        family=families[row["family"].upper()],
+                    )
+                )
+            except (KeyError, ValueError, AttributeError) as err:
+                errors.append(f"line {reader.line_num}: {err!r} in {row}")
+    if len(errors) > 0:
+        raise ValueError(f"{csv_path} has invalid rows\n" + "\n".join(errors))
+    return places
+
+
+def family_column(couple: Couples) -> str:
+    """Csv column of couple's family, our_family for us else e.g. ali_family."""
+    return "our_family" if couple == Couples.US else f"{couple.value.lower()}_family"
+
+
+def export_final_csv(schedules: Dict[Couples, Iterable[Place]], csv_path: Path) -> None:
+    """Stream one row per year and holiday with family of every couple, columns year, holiday then family column of each couple.
+
+    Each schedule must be in year order, holidays within a year in any order. Schedules are read together one year at a time,
+    so only one year is held in memory whatever the horizon or number of couples. Couple with no place at a year and holiday is left blank.
+    """
+    years = {
+        couple: itertools.groupby(places, key=lambda place: place.year)
+        for couple, places in schedules.items()
     }
-    for our, ali, lauren in zip(our_places, ali_places, lauren_places):
-        pd_dict["year"].append(our.year)
-        pd_dict["holiday"].append(our.holiday.value)
-        pd_dict["our_family"].append(our.family.value)
-        pd_dict["ali_family"].append(ali.family.value)
-        pd_dict["lauren_family"].append(lauren.family.value)
-    pd_df = pd.DataFrame(pd_dict)
-    pd_df.to_csv(csv_path, index=None)
+    heads = {couple: next(groups, None) for couple, groups in years.items()}
+    with open(csv_path, "w", newline="") as csv_file:
+        writer = csv.writer(csv_file, lineterminator="\n")
+        writer.writerow(
+            ["year", "holiday"] + [family_column(couple) for couple in schedules]
+        )
+        while any(head is not None for head in heads.values()):
+            year = min(head[0] for head in heads.values() if head is not None)
+            families: Dict[Couples, Dict[Holidays, Families]] = {}
+            for couple, head in heads.items():
+                if head is None or head[0] != year:
+                    continue
+                families[couple] = {place.holiday: place.family for place in head[1]}
+                heads[couple] = next(years[couple], None)
+                next_head = heads[couple]
+                if next_head is not None and next_head[0] <= year:
+                    raise ValueError(
+                        f"Schedule of {couple.value} not in year order at {next_head[0]}"
+                    )
+            for holiday in Holidays:
+                row = [families.get(couple, {}).get(holiday) for couple in schedules]
+                if all(family is None for family in row):
+                    continue
+                writer.writerow(
+                    [year, holiday.value]
+                    + ["" if family is None else family.value for family in row]
+                )
@@ -1,9 +1,20 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, Tuple
 
+import numpy as np
 from holidays.constants import Couples, Families, Holidays
 
+# Integer codes of enums, code is index of member in enum order, holiday code is also its order within a year.
+COUPLE_CODES: Dict[Couples, int] = {couple: code for code, couple in enumerate(Couples)}
+HOLIDAY_CODES: Dict[Holidays, int] = {
+    holiday: code for code, holiday in enumerate(Holidays)
+}
+FAMILY_CODES: Dict[Families, int] = {
+    family: code for code, family in enumerate(Families)
+}
+
 
 @dataclass
 class Place:
@@ -29,14 +40,71 @@ class Place:
         """Printable format for this object."""
         return f"{self.couple.value} at {self.family.value} for {self.holiday.value} in {self.year}"
 
+    @property
+    def key(self) -> int:
+        """Sort key of year then holiday order as one int, consecutive holidays have consecutive keys."""
+        return self.year * len(HOLIDAY_CODES) + HOLIDAY_CODES[self.holiday]
+
     def __lt__(self, other: Place) -> bool:
-        holiday_order = [holiday for holiday in Holidays]
-        if self.year != other.year:
-            return self.year < other.year
-        return holiday_order.index(self.holiday) < holiday_order.index(other.holiday)
+        return self.key < other.key
 
     def __gt__(self, other: Place) -> bool:
-        holiday_order = [holiday for holiday in Holidays]
-        if self.year != other.year:
-            return self.year > other.year
-        return holiday_order.index(self.holiday) > holiday_order.index(other.holiday)
+        return self.key > other.key
+
+
+class Schedule:
+    """Places of one couple in year and holiday order, with key and family code of each as arrays for aligning and matching.
+
+    Places are copied into a new sorted list so the given list is never reordered.
+
+    Attributes
+    ----------
+    places: List[Place]
+        Places sorted by key.
+    keys: np.ndarray
+        Key of each place, see Place.key.
+    families: np.ndarray
+        Family code of each place.
+    """
+
+    def __init__(self, places: Iterable[Place]) -> None:
+        self.places = sorted(places, key=lambda place: place.key)
+        self.keys = np.fromiter(
+            (place.key for place in self.places), dtype=np.int64, count=len(self.places)
+        )
+        self.families = np.fromiter(
+            (FAMILY_CODES[place.family] for place in self.places),
+            dtype=np.int8,
+            count=len(self.places),
+        )
+        if np.any(np.diff(self.keys) == 0):
+            raise ValueError("Schedule has more than one place for a year and holiday")
+
+    def __len__(self) -> int:
+        """Number of places."""
+        return len(self.places)
+
+    def __iter__(self) -> Iterator[Place]:
+        """Places in order."""
+        return iter(self.places)
+
+    def align(self, other: Schedule) -> Tuple[np.ndarray, np.ndarray]:
+        """Positions in this and other schedule of each year and holiday both have, in order.
+
+        Keys are dense ints, so other's positions are scattered into an array over the key range and read back by this schedule's keys, O(n) with no search.
+        """
+        if len(self) == 0 or len(other) == 0:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty
+        low = min(self.keys[0], other.keys[0])
+        high = max(self.keys[-1], other.keys[-1])
+        other_pos = np.full(high - low + 1, -1, dtype=np.intp)
+        other_pos[other.keys - low] = np.arange(len(other))
+        found = other_pos[self.keys - low]
+        ours = np.flatnonzero(found >= 0)
+        return ours, found[ours]
+
+    def matches(self, other: Schedule) -> int:
+        """Number of years and holidays both schedules are at the same family."""
+        ours, theirs = self.align(other)
+        return int(np.count_nonzero(self.families[ours] == other.families[theirs]))
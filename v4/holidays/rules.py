@@ -0,0 +1,96 @@
+import random
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from holidays.constants import Couples, Families, Holidays
+from holidays.place import Place
+
+# Family of each holiday of one year, in order places of the year are made.
+YearFamilies = List[Tuple[Holidays, Families]]
+
+
+class Rule(ABC):
+    """Rule giving the families of a couple for each year, places are made lazily one year at a time.
+
+    Years are counted by index from the start year, so rules are the same whatever year they start.
+    Subclasses must define year_families, else they cannot be made.
+    """
+
+    couple: Couples
+
+    @abstractmethod
+    def year_families(self, year_idx: int) -> YearFamilies:
+        """Family of each holiday for year index."""
+
+    def places(self, start_year: int, num_years: int) -> Iterator[Place]:
+        """Generate places of every year from start year, only one year is held at a time."""
+        for year_idx in range(num_years):
+            for holiday, family in self.year_families(year_idx):
+                yield Place(
+                    year=start_year + year_idx,
+                    couple=self.couple,
+                    holiday=holiday,
+                    family=family,
+                )
+
+
+@dataclass
+class CycleRule(Rule):
+    """Couple cycles through rotation of families, each holiday reads rotation at year index plus its offset.
+
+    e.g. rotation [Palombo, GONE, Pendola] with eve offset 2, eve of year index 1 is rotation[(1 + 2) % 3] = Palombo.
+    Holidays in fixed are always at their family instead, holidays in neither have offset 0.
+    """
+
+    couple: Couples
+    rotation: List[Families]
+    offsets: Dict[Holidays, int] = field(default_factory=dict)
+    fixed: Dict[Holidays, Families] = field(default_factory=dict)
+
+    def year_families(self, year_idx: int) -> YearFamilies:
+        """Family of each holiday in holiday order."""
+        return [
+            (
+                holiday,
+                (
+                    self.fixed[holiday]
+                    if holiday in self.fixed
+                    else self.rotation[
+                        (year_idx + self.offsets.get(holiday, 0)) % len(self.rotation)
+                    ]
+                ),
+            )
+            for holiday in Holidays
+        ]
+
+
+# Branch makes families of a year from year index, families of each sibling that year and random generator of rule.
+Branch = Callable[
+    [int, Dict[Couples, Dict[Holidays, Families]], Optional[random.Random]],
+    YearFamilies,
+]
+
+
+@dataclass
+class ConditionalRule(Rule):
+    """Couple follows first branch whose condition holds for the year index, branches see that year of each sibling rule.
+
+    e.g. branches [(lambda year_idx: year_idx % 2 == 0, match_ali), (lambda year_idx: True, other_years)]
+    Branches making random choices use rng, None is the global random module.
+    """
+
+    couple: Couples
+    siblings: List[Rule]
+    branches: List[Tuple[Callable[[int], bool], Branch]]
+    rng: Optional[random.Random] = None
+
+    def year_families(self, year_idx: int) -> YearFamilies:
+        """Families of first branch that applies to year index."""
+        siblings = {
+            rule.couple: dict(rule.year_families(year_idx)) for rule in self.siblings
+        }
+        for condition, branch in self.branches:
+            if condition(year_idx):
+                return branch(year_idx, siblings, self.rng)
+        raise ValueError(f"No branch of {self.couple.value} rule for year {year_idx}")
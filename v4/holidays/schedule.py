@@ -1,166 +1,103 @@
+import dataclasses
 import random
+from typing import Dict, Optional
 
 from holidays.constants import Couples, Families, Holidays
 from holidays.place import Place
+from holidays.rules import ConditionalRule, CycleRule, YearFamilies
 
+# Holidays after easter in order
+LATER_HOLIDAYS = [Holidays.THANKSGIVING, Holidays.EVE, Holidays.CHRISTMAS]
 
-def ali_rule(start_year: int, num_years: int) -> list[Place]:
+# Go from (Pendola,Gone,Palombo) -> (Palombo,Pendola,Gone) Easters
+# Go from (Pendola,Gone,Palombo) -> (Palombo,Pendola,Gone) Thanks,Eve,Christmas
+ALI_RULE = CycleRule(
+    couple=Couples.ALI,
+    rotation=[Families.PALOMBO, Families.GONE, Families.PENDOLA],
+    offsets={Holidays.EVE: 2, Holidays.CHRISTMAS: 1},
+)
+
+LAUREN_RULE = CycleRule(
+    couple=Couples.LAUREN,
+    rotation=[Families.GONE, Families.GRESKO],
+    fixed={Holidays.EASTER: Families.GONE},
+)
 
-    rotation = [Families.PALOMBO, Families.GONE, Families.PENDOLA]
-    # Go from (Pendola,Gone,Palombo) -> (Palombo,Pendola,Gone) Easters
-    # Go from (Pendola,Gone,Palombo) -> (Palombo,Pendola,Gone) Thanks,Eve,Christmas
-    holidays = [
-        [
-            Place(
-                year=year + start_year,
-                couple=Couples.ALI,
-                holiday=Holidays.EASTER,
-                family=rotation[year % len(rotation)],
-            ),
-            Place(
-                year=year + start_year,
-                couple=Couples.ALI,
-                holiday=Holidays.THANKSGIVING,
-                family=rotation[year % len(rotation)],
-            ),
-            Place(
-                year=year + start_year,
-                couple=Couples.ALI,
-                holiday=Holidays.EVE,
-                family=rotation[(year + 2) % len(rotation)],
-            ),
-            Place(
-                year=year + start_year,
-                couple=Couples.ALI,
-                holiday=Holidays.CHRISTMAS,
-                family=rotation[(year + 1) % len(rotation)],
-            ),
-        ]
-        for year in range(num_years)
+
+def match_ali_year(
+    year_idx: int,
+    siblings: Dict[Couples, Dict[Holidays, Families]],
+    rng: Optional[random.Random],
+) -> YearFamilies:
+    """On off year, Gresko easter, same as Ali on first 2 holidays after easter Ali is not GONE, remaining holiday Gresko."""
+    ali = siblings[Couples.ALI]
+    unused_holiday = [Holidays.CHRISTMAS, Holidays.EVE, Holidays.THANKSGIVING]
+    hol1, hol2 = [hol for hol in LATER_HOLIDAYS if ali[hol] != Families.GONE][:2]
+    unused_holiday.remove(hol1)
+    unused_holiday.remove(hol2)
+    return [
+        (Holidays.EASTER, Families.GRESKO),
+        (hol1, ali[hol1]),
+        (hol2, ali[hol2]),
+        (unused_holiday[0], Families.GRESKO),
     ]
-    # flatten
-    return sum(holidays, [])
 
 
-def lauren_rule(start_year: int, num_years: int) -> list[Place]:
-    rotation = [Families.GONE, Families.GRESKO]
-    holidays = [
-        [
-            Place(
-                year=year + start_year,
-                couple=Couples.LAUREN,
-                holiday=Holidays.EASTER,
-                family=Families.GONE,
-            ),
-            Place(
-                year=year + start_year,
-                couple=Couples.LAUREN,
-                holiday=Holidays.THANKSGIVING,
-                family=rotation[year % len(rotation)],
-            ),
-            Place(
-                year=year + start_year,
-                couple=Couples.LAUREN,
-                holiday=Holidays.EVE,
-                family=rotation[year % len(rotation)],
-            ),
-            Place(
-                year=year + start_year,
-                couple=Couples.LAUREN,
-                holiday=Holidays.CHRISTMAS,
-                family=rotation[year % len(rotation)],
-            ),
-        ]
-        for year in range(num_years)
+def gresko_with_lauren_year(
+    year_idx: int,
+    siblings: Dict[Couples, Dict[Holidays, Families]],
+    rng: Optional[random.Random],
+) -> YearFamilies:
+    """Gresko for holiday Ali is GONE at and one random other holiday Lauren is there, Ali's family on the remaining one and the other family easter."""
+    ali, lauren = siblings[Couples.ALI], siblings[Couples.LAUREN]
+    unused_holiday = [Holidays.CHRISTMAS, Holidays.EVE, Holidays.THANKSGIVING]
+    lauren_holidays = [hol for hol in LATER_HOLIDAYS if lauren[hol] != Families.GONE]
+    # use gresko for holiday ali gone at if lauren there, else use minimum holiday in holiday counts where lauren is there
+    hol1 = next(hol for hol in LATER_HOLIDAYS if ali[hol] == Families.GONE)
+    unused_holiday.remove(hol1)
+    lauren_holidays.remove(hol1)
+    # 2nd gresko holiday is the next minimum holiday used in holiday counts
+    hol2 = (rng or random).choice(lauren_holidays)
+    unused_holiday.remove(hol2)
+    # Remaining holiday with Ali matches holiday Ali is at that isn't taken
+    rem_holiday = unused_holiday[0]
+    # Easter is the opposite family
+    rem_families = [Families.PENDOLA, Families.PALOMBO]
+    rem_families.remove(ali[rem_holiday])
+    return [
+        (Holidays.EASTER, rem_families[0]),
+        (hol1, Families.GRESKO),
+        (hol2, Families.GRESKO),
+        (rem_holiday, ali[rem_holiday]),
     ]
-    # flatten
-    return sum(holidays, [])
-
-
-def our_rule(start_year: int, num_years: int) -> list[Place]:
-    ali_places = ali_rule(start_year=start_year, num_years=num_years)
-    lauren_places = lauren_rule(start_year=start_year, num_years=num_years)
-
-    places = []
-
-    for year in range(num_years):
-        off_year = year % 2 == 0
-        unused_holiday = [Holidays.CHRISTMAS, Holidays.EVE, Holidays.THANKSGIVING]
-        # Get non-easter holidays of given year for Ali
-        ali_holidays = [
-            pl
-            for pl in ali_places[year * len(Holidays) + 1 : (year + 1) * len(Holidays)]
-            if pl.family != Families.GONE
-        ]
-        if off_year:
-            # On off year, Gresko easter
-            easter = Place(
-                year=year + start_year,
-                couple=Couples.US,
-                holiday=Holidays.EASTER,
-                family=Families.GRESKO,
-            )
-            # Set our 2 places to same as Ali's
-            hol1, hol2 = ali_holidays[:2]
-            hol1.couple = Couples.US
-            unused_holiday.pop(unused_holiday.index(hol1.holiday))
-            hol2.couple = Couples.US
-            unused_holiday.pop(unused_holiday.index(hol2.holiday))
-            # Remaining holiday Gresko
-            rem_holiday = Place(
-                year=year + start_year,
-                couple=Couples.US,
-                holiday=unused_holiday[0],
-                family=Families.GRESKO,
-            )
-        else:
-            ali_gone = [
-                pl
-                for pl in ali_places[
-                    year * len(Holidays) + 1 : (year + 1) * len(Holidays)
-                ]
-                if pl.family == Families.GONE
-            ]
-            lauren_holidays = [
-                pl.holiday
-                for pl in lauren_places[
-                    year * len(Holidays) + 1 : (year + 1) * len(Holidays)
-                ]
-                if pl.family != Families.GONE
-            ]
-            # use gresko for holiday ali gone at if lauren there, else use minimum holiday in holiday counts where lauren is there
-            hol1_holiday = ali_gone[0].holiday
-            hol1 = Place(
-                year=year + start_year,
-                couple=Couples.US,
-                holiday=hol1_holiday,
-                family=Families.GRESKO,
-            )
-            unused_holiday.pop(unused_holiday.index(hol1.holiday))
-            lauren_holidays.pop(lauren_holidays.index(hol1.holiday))
-            # 2nd gresko holiday is the next minimum holiday used in holiday counts
-            hol2_holiday = random.choice(lauren_holidays)
-            hol2 = Place(
-                year=year + start_year,
-                couple=Couples.US,
-                holiday=hol2_holiday,
-                family=Families.GRESKO,
-            )
-            unused_holiday.pop(unused_holiday.index(hol2.holiday))
-            lauren_holidays.pop(lauren_holidays.index(hol2.holiday))
-            # Remaining holiday with Ali matches holiday Ali is at that isn't taken
-            rem_holiday = [pl for pl in ali_holidays if pl.holiday == unused_holiday[0]]
-            rem_holiday = rem_holiday[0]
-            rem_holiday.couple = Couples.US
-
-            # Easter is the opposite family
-            rem_families = [Families.PENDOLA, Families.PALOMBO]
-            rem_families.pop(rem_families.index(rem_holiday.family))
-            easter = Place(
-                year=year + start_year,
-                couple=Couples.US,
-                holiday=Holidays.EASTER,
-                family=rem_families[0],
-            )
-        places += [easter, hol1, hol2, rem_holiday]
-    return places
+
+
+OUR_RULE = ConditionalRule(
+    couple=Couples.US,
+    siblings=[ALI_RULE, LAUREN_RULE],
+    branches=[
+        (lambda year_idx: year_idx % 2 == 0, match_ali_year),
+        (lambda year_idx: True, gresko_with_lauren_year),
+    ],
+)
+
+
+def ali_rule(start_year: int, num_years: int) -> list[Place]:
+    """Places of Ali, use ALI_RULE.places to generate them lazily instead."""
+    return list(ALI_RULE.places(start_year, num_years))
+
+
+def lauren_rule(start_year: int, num_years: int) -> list[Place]:
+    """Places of Lauren, use LAUREN_RULE.places to generate them lazily instead."""
+    return list(LAUREN_RULE.places(start_year, num_years))
+
+
+def our_rule(
+    start_year: int, num_years: int, rng: Optional[random.Random] = None
+) -> list[Place]:
+    """Places of us, in order easter, the 2 holidays picked first then remaining holiday each year, use OUR_RULE.places to generate them lazily instead.
+
+    Random choices are drawn from rng, e.g. random.Random(seed) for a run independent of other runs, None uses the global random module.
+    """
+    rule = OUR_RULE if rng is None else dataclasses.replace(OUR_RULE, rng=rng)
+    return list(rule.places(start_year, num_years))
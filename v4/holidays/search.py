@@ -0,0 +1,105 @@
+import heapq
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from holidays.constants import Couples, Families, Holidays
+from holidays.place import Place, Schedule
+from holidays.schedule import ALI_RULE, LAUREN_RULE, our_rule
+from holidays.stats import crosstab, table_count
+
+HOSTS = [family for family in Families if family is not Families.GONE]
+
+
+@dataclass
+class SeedResult:
+    """Metrics of our_rule run with one seed, score is total matches minus unevenness.
+
+    unevenness is per family how far each holiday count is above that family's least held holiday, summed,
+    e.g. Gresko easter thanks eve christmas [3,2,4,5] is 1+0+2+3 = 6.
+    """
+
+    seed: int
+    matches: Dict[Couples, int]
+    unevenness: int
+    score: int
+
+
+def unevenness(places: List[Place], couple: Couples = Couples.US) -> int:
+    """How unevenly each family gets the holidays, 0 is each family holding every holiday equally often."""
+    counts = crosstab(places)
+    total = 0
+    for family in HOSTS:
+        holiday_counts = [
+            table_count(counts, holiday, family, couple) for holiday in Holidays
+        ]
+        total += sum(holiday_counts) - min(holiday_counts) * len(holiday_counts)
+    return total
+
+
+def score_seed(
+    seed: int, start_year: int, num_years: int, siblings: Dict[Couples, Schedule]
+) -> SeedResult:
+    """Run our_rule with its own generator of seed and score it against sibling schedules, same seed always gives same result."""
+    places = our_rule(start_year, num_years, rng=random.Random(seed))
+    ours = Schedule(places)
+    matches = {couple: ours.matches(schedule) for couple, schedule in siblings.items()}
+    uneven = unevenness(places)
+    return SeedResult(
+        seed=seed,
+        matches=matches,
+        unevenness=uneven,
+        score=sum(matches.values()) - uneven,
+    )
+
+
+def sibling_schedules(start_year: int, num_years: int) -> Dict[Couples, Schedule]:
+    """Schedule of each sibling rule our_rule follows."""
+    return {
+        rule.couple: Schedule(rule.places(start_year, num_years))
+        for rule in (ALI_RULE, LAUREN_RULE)
+    }
+
+
+# Start year, num years and sibling schedules of the worker process, set once by the pool initializer.
+_SIBLINGS: Optional[Tuple[int, int, Dict[Couples, Schedule]]] = None
+
+
+def _init_worker(start_year: int, num_years: int) -> None:
+    """Make sibling schedules once in worker for all its seeds."""
+    global _SIBLINGS
+    _SIBLINGS = (start_year, num_years, sibling_schedules(start_year, num_years))
+
+
+def _score_worker(seed: int) -> SeedResult:
+    """Score seed with sibling schedules of this worker."""
+    assert _SIBLINGS is not None, "Worker not initialized with siblings"
+    return score_seed(seed, *_SIBLINGS)
+
+
+def search(
+    seeds: Iterable[int],
+    start_year: int,
+    num_years: int,
+    top: int = 10,
+    max_workers: Optional[int] = None,
+) -> List[SeedResult]:
+    """Score our_rule for every seed over process pool and return the top best, highest score first then lowest seed.
+
+    Seeds are sent in chunks and only the best results are kept.
+    """
+    seeds = list(seeds)
+    max_workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(seeds) // (max_workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(start_year, num_years),
+    ) as executor:
+        return heapq.nsmallest(
+            top,
+            executor.map(_score_worker, seeds, chunksize=chunksize),
+            key=lambda result: (-result.score, result.seed),
+        )
@@ -1,8 +1,56 @@
-from typing import Optional
+from typing import Callable, Dict, Iterable, Optional, Union
 
 import numpy as np
 from holidays.constants import Couples, Families, Holidays
-from holidays.place import Place
+from holidays.place import COUPLE_CODES, FAMILY_CODES, HOLIDAY_CODES, Place, Schedule
+
+
+def crosstab(
+    places: Iterable[Place], where: Optional[Callable[[Place], bool]] = None
+) -> np.ndarray:
+    """Count of places per couple, holiday and family in one pass, shape (couple, holiday, family) indexed by enum order.
+
+    Each place is encoded once to a flat cell code and all cells counted by one bincount,
+    so any number of couples, holidays and families are then read from the tensor without scanning places again.
+    where filters places in the same pass, e.g. lambda place: place.year >= 2023.
+    """
+    num_holidays, num_families = len(HOLIDAY_CODES), len(FAMILY_CODES)
+    codes = np.fromiter(
+        (
+            (COUPLE_CODES[place.couple] * num_holidays + HOLIDAY_CODES[place.holiday])
+            * num_families
+            + FAMILY_CODES[place.family]
+            for place in places
+            if where is None or where(place)
+        ),
+        dtype=np.intp,
+    )
+    return np.bincount(
+        codes, minlength=len(COUPLE_CODES) * num_holidays * num_families
+    ).reshape(len(COUPLE_CODES), num_holidays, num_families)
+
+
+def _axis(
+    codes: Dict, member: Optional[Union[Couples, Holidays, Families]]
+) -> Union[int, slice]:
+    """Index of member on crosstab axis, all of axis if None."""
+    return slice(None) if member is None else codes[member]
+
+
+def table_count(
+    table: np.ndarray,
+    holiday: Optional[Holidays] = None,
+    family: Optional[Families] = None,
+    couple: Optional[Couples] = None,
+) -> int:
+    """Number of places in crosstab with given holiday family and couple, any if None."""
+    return int(
+        table[
+            _axis(COUPLE_CODES, couple),
+            _axis(HOLIDAY_CODES, holiday),
+            _axis(FAMILY_CODES, family),
+        ].sum()
+    )
 
 
 def total_filter(
@@ -11,38 +59,26 @@ def total_filter(
     family: Optional[Families] = None,
     couple: Optional[Couples] = None,
 ) -> int:
-    place_filter = (
-        np.array([place.holiday == holiday for place in places])
-        if holiday is not None
-        else np.array([True] * len(places))
-    )
-    holiday_filter = (
-        np.array([place.family == family for place in places])
-        if family is not None
-        else np.array([True] * len(places))
-    )
-    couple_filter = (
-        np.array([place.couple == couple for place in places])
-        if couple is not None
-        else np.array([True] * len(places))
-    )
-    return sum(place_filter & holiday_filter & couple_filter)
+    """Number of places with given holiday family and couple, any if None. For several counts make one crosstab and use table_count."""
+    return table_count(crosstab(places), holiday, family, couple)
 
 
-def matches(our_schedule: list[Place], other_schedule: list[Place]):
-    our_schedule.sort()
-    other_schedule.sort()
-    for our_pl, other_pl in zip(our_schedule, other_schedule):
-        if our_pl.year != other_pl.year or our_pl.holiday != other_pl.holiday:
-            print("Schedules out of align!, cannot make matches")
-            return 0
-    return sum(
-        our_pl.same_place(other_pl)
-        for our_pl, other_pl in zip(our_schedule, other_schedule)
-    )
+def matches(our_schedule: list[Place], other_schedule: list[Place]) -> int:
+    """Number of holidays both schedules are at the same place, schedules are sorted copies so inputs are left as they are.
+
+    Both must cover the same years and holidays up to the shorter one, else prints they are out of align and gives 0.
+    """
+    ours, other = Schedule(our_schedule), Schedule(other_schedule)
+    num = min(len(ours), len(other))
+    if not np.array_equal(ours.keys[:num], other.keys[:num]):
+        print("Schedules out of align!, cannot make matches")
+        return 0
+    return ours.matches(other)
 
 
-def spread_table(our_schedule: list[Place]):
+def spread_table(our_schedule: list[Place], couple: Couples = Couples.US):
+    """Print count of couple's places per holiday and family with totals, all read from one crosstab."""
+    counts = crosstab(our_schedule)
     table = []
     print(
         "".join(
@@ -53,12 +89,12 @@ def spread_table(our_schedule: list[Place]):
         table.append([])
         row_val = 0
         for family in Families:
-            val = total_filter(our_schedule, holiday, family, Couples.US)
+            val = table_count(counts, holiday, family, couple)
             row_val += val
             table[idx].append(f"{val:10}")
         print("".join([f"{holiday.value:15}"] + table[idx] + [f"{row_val:10}"]))
     total = []
     for family in Families:
-        val = total_filter(our_schedule, holiday=None, family=family, couple=Couples.US)
+        val = table_count(counts, holiday=None, family=family, couple=couple)
         total.append(f"{val:10}")
     print("".join(["Total" + " " * 10] + total))
@@ -0,0 +1,43 @@
+import argparse
+from pathlib import Path
+
+from holidays.io import import_places
+from holidays.search import search
+
+
+def main() -> None:
+    """Search seeds of our_rule for the best matches with siblings and most even spread, rerun a seed with our_rule(rng=random.Random(seed))."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument(
+        "--seeds", type=int, default=10000, help="Number of seeds from 0."
+    )
+    parser.add_argument("--years", type=int, default=13)
+    parser.add_argument(
+        "--history",
+        type=Path,
+        default=Path("history.csv"),
+        help="Schedule starts year after its last.",
+    )
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    start_year = max(place.year for place in import_places(args.history)) + 1
+    results = search(
+        range(args.seeds),
+        start_year,
+        args.years,
+        top=args.top,
+        max_workers=args.workers,
+    )
+    for result in results:
+        matches = " ".join(
+            f"{couple.value} {count}" for couple, count in result.matches.items()
+        )
+        print(
+            f"seed {result.seed:8} score {result.score:4} matches {matches} unevenness {result.unevenness}"
+        )
+
+
+if __name__ == "__main__":
+    main()